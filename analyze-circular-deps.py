@@ -2,76 +2,162 @@
 
 import os
 import re
-from pathlib import Path
 from collections import defaultdict
+from functools import lru_cache
+
+# Key managers and their locations
+KEY_FILES = {
+    'NavigationManager': 'Core/Navigation',
+    'FirebaseManager': 'Core/Networking', 
+    'CoreDataManager': 'Core/Utilities',
+    'DataSyncManager': 'Core/Utilities',
+    'AnalyticsManager': 'Core/Utilities',
+    'VoiceInteractionContext': 'Core/Models',
+    'MedicationConflict': 'Core/Models'
+}
+
+# Direct usage patterns, compiled once per key file
+KEY_PATTERNS = {
+    key_file: [re.compile(pattern) for pattern in (
+        rf'{key_file}\.shared',
+        rf'@State.*{key_file}',
+        rf'@StateObject.*{key_file}',
+        rf'let.*{key_file}',
+        rf'var.*{key_file}',
+        rf':\s*{key_file}',
+        rf'NavigationDestination.*{key_file}',
+        rf'SheetDestination.*{key_file}'
+    )]
+    for key_file in KEY_FILES
+}
+
+# Literal usages that need no regex: `X.shared` and `: X` each satisfy one of
+# the patterns above, and substring search is far cheaper than re
+KEY_LITERALS = {
+    key_file: (f'{key_file}.shared', f': {key_file}')
+    for key_file in KEY_FILES
+}
+
+def usage_source(key_file):
+    """Regex source matching any usage pattern of key_file, specialized for the scan"""
+    # @StateObject is covered by @State; gaps are bounded so a failed attempt
+    # backtracks over at most 80 characters instead of the rest of the line
+    return (
+        f'{key_file}\\.shared'
+        f'|(?:@State|let|var|NavigationDestination|SheetDestination)[^\\n]{{0,80}}{key_file}'
+        f'|:\\s*{key_file}\\b'
+    )
+
+# Usage patterns for a set of key files as one alternation, so a single pass
+# over the file reports every key file it depends on (by group name)
+@lru_cache(maxsize=None)
+def dependency_re(key_files):
+    """Compile the usage patterns of the given key files into one regex"""
+    return re.compile('|'.join(
+        f'(?P<{key_file}>{usage_source(key_file)})'
+        for key_file in KEY_FILES if key_file in key_files
+    ))
+
+# Build the full scan regex up front
+dependency_re(frozenset(KEY_FILES))
+
+# Directories (by name fragment) that are not part of the app sources
+SKIP_DIRS = ('Tests', 'Build', '.build', 'DerivedData')
+
+def walk_swift(root, skip=SKIP_DIRS):
+    """Yield Swift file paths under root in os.walk order, pruning skipped directories"""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not any(fragment in entry.name for fragment in skip):
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith('.swift'):
+                        yield entry.path
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+def find_dependencies(content):
+    """Return the set of key files that a Swift source depends on"""
+    found = set()
+    
+    # Every pattern names its key file, so only key files mentioned can match;
+    # most of those are settled by a literal usage without running any regex
+    remaining = set()
+    for key_file, literals in KEY_LITERALS.items():
+        if key_file in content:
+            if any(literal in content for literal in literals):
+                found.add(key_file)
+            else:
+                remaining.add(key_file)
+    if not remaining:
+        return found
+    
+    # Find imports and usages in a single scan, dropping each key file's
+    # patterns from the search once it has been found
+    pos = 0
+    while remaining:
+        match = dependency_re(frozenset(remaining)).search(content, pos)
+        if match is None:
+            break
+        remaining.discard(match.lastgroup)
+        found.add(match.lastgroup)
+        pos = match.end()
+    
+    # A match for one key file can swallow a usage of another
+    # (e.g. `let a = X.shared; let b: Y` matches as one `let.*Y`) and the scan
+    # does not look past 80 characters, so confirm the key files that were
+    # not reported with their full patterns
+    for key_file in remaining:
+        if any(pattern.search(content) for pattern in KEY_PATTERNS[key_file]):
+            found.add(key_file)
+    
+    return found
 
 def analyze_dependencies():
     """Analyze Swift file dependencies to find circular imports"""
     
-    project_root = Path('/Users/cvr/Documents/Project/MedicationManager/MedicationManager')
+    project_root = '/Users/cvr/Documents/Project/MedicationManager/MedicationManager'
+    root_prefix = os.path.join(project_root, '')
     dependencies = defaultdict(set)
-    file_locations = {}
-    
-    # Key managers and their locations
-    key_files = {
-        'NavigationManager': 'Core/Navigation',
-        'FirebaseManager': 'Core/Networking', 
-        'CoreDataManager': 'Core/Utilities',
-        'DataSyncManager': 'Core/Utilities',
-        'AnalyticsManager': 'Core/Utilities',
-        'VoiceInteractionContext': 'Core/Models',
-        'MedicationConflict': 'Core/Models'
-    }
-    
-    # Collect all Swift files
-    for root, dirs, files in os.walk(project_root):
-        # Skip test and build directories
-        if any(skip in root for skip in ['Tests', 'Build', '.build', 'DerivedData']):
-            continue
+    # File metadata as parallel maps keyed by file name
+    layer_of = {}
+    path_of = {}
+    full_path_of = {}
+    
+    # Collect all Swift files, skipping test and build directories
+    for file_path in walk_swift(project_root):
+        relative_path = file_path[len(root_prefix):]
+        file_name = os.path.splitext(os.path.basename(file_path))[0]
+        
+        # Determine layer (Core, Features, App)
+        layer = relative_path.split('/', 1)[0]
+        
+        layer_of[file_name] = layer
+        path_of[file_name] = relative_path
+        full_path_of[file_name] = file_path
+        
+        # Read file and find dependencies
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
             
-        for file in files:
-            if file.endswith('.swift'):
-                file_path = Path(root) / file
-                relative_path = file_path.relative_to(project_root)
-                file_name = file_path.stem
-                
-                # Determine layer (Core, Features, App)
-                parts = str(relative_path).split('/')
-                layer = parts[0] if parts else 'Unknown'
-                
-                file_locations[file_name] = {
-                    'path': str(relative_path),
-                    'layer': layer,
-                    'full_path': str(file_path)
-                }
-                
-                # Read file and find dependencies
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    # Find imports and usages
-                    for key_file in key_files:
-                        # Direct usage patterns
-                        patterns = [
-                            rf'{key_file}\.shared',
-                            rf'@State.*{key_file}',
-                            rf'@StateObject.*{key_file}',
-                            rf'let.*{key_file}',
-                            rf'var.*{key_file}',
-                            rf':\s*{key_file}',
-                            rf'NavigationDestination.*{key_file}',
-                            rf'SheetDestination.*{key_file}'
-                        ]
-                        
-                        for pattern in patterns:
-                            if re.search(pattern, content):
-                                dependencies[file_name].add(key_file)
-                                break
-                    
-                except Exception as e:
-                    print(f"Error reading {file_path}: {e}")
+            found = find_dependencies(content)
+            if found:
+                dependencies[file_name].update(found)
+            
+        except Exception as e:
+            print(f"Error reading {file_path}: {e}")
     
+    report_dependencies(dependencies, layer_of, path_of, full_path_of)
+
+def report_dependencies(dependencies, layer_of, path_of, full_path_of):
+    """Print the dependency analysis report"""
     # Analyze circular dependencies
     print("=" * 80)
     print("DEPENDENCY ANALYSIS REPORT")
@@ -81,15 +167,13 @@ def analyze_dependencies():
     print("\n🚫 ARCHITECTURAL VIOLATIONS (Features -> Core):")
     violations_found = False
     for file_name, deps in dependencies.items():
-        if file_name in file_locations:
-            file_info = file_locations[file_name]
-            if file_info['layer'] == 'Features':
-                core_deps = [d for d in deps if d in file_locations and file_locations[d]['layer'] == 'Core']
-                if core_deps:
-                    violations_found = True
-                    print(f"\n  ❌ {file_name} (Features) depends on:")
-                    for dep in core_deps:
-                        print(f"     - {dep} (Core)")
+        if layer_of.get(file_name) == 'Features':
+            core_deps = [d for d in deps if layer_of.get(d) == 'Core']
+            if core_deps:
+                violations_found = True
+                print(f"\n  ❌ {file_name} (Features) depends on:")
+                for dep in core_deps:
+                    print(f"     - {dep} (Core)")
     
     if not violations_found:
         print("  ✅ No architectural violations found")
@@ -97,16 +181,16 @@ def analyze_dependencies():
     # 2. Analyze key manager dependencies
     print("\n\n📊 KEY MANAGER DEPENDENCIES:")
     for manager in ['NavigationManager', 'FirebaseManager', 'CoreDataManager']:
-        if manager in file_locations:
+        if manager in path_of:
             print(f"\n{manager}:")
-            print(f"  Location: {file_locations[manager]['path']}")
+            print(f"  Location: {path_of[manager]}")
             
             # Who depends on this manager
             dependents = []
             for file_name, deps in dependencies.items():
                 if manager in deps and file_name != manager:
-                    if file_name in file_locations:
-                        layer = file_locations[file_name]['layer']
+                    layer = layer_of.get(file_name)
+                    if layer is not None:
                         dependents.append((file_name, layer))
             
             if dependents:
@@ -146,15 +230,14 @@ def analyze_dependencies():
     if 'ConflictDetailView' in dependencies:
         print(f"\nConflictDetailView dependencies:")
         for dep in dependencies['ConflictDetailView']:
-            if dep in file_locations:
-                print(f"  - {dep} ({file_locations[dep]['layer']})")
+            if dep in layer_of:
+                print(f"  - {dep} ({layer_of[dep]})")
     
     # Check VoiceInteractionContext usage
     voice_users = []
     for file_name, deps in dependencies.items():
-        if 'VoiceInteractionContext' in deps:
-            if file_name in file_locations:
-                voice_users.append((file_name, file_locations[file_name]['layer']))
+        if 'VoiceInteractionContext' in deps and file_name in layer_of:
+            voice_users.append((file_name, layer_of[file_name]))
     
     if voice_users:
         print(f"\nVoiceInteractionContext is used by {len(voice_users)} files:")
@@ -165,7 +248,7 @@ def analyze_dependencies():
     print("\n\n🧭 NAVIGATION PATTERN ANALYSIS:")
     nav_pattern_files = []
     
-    for file_name in file_locations:
+    for file_name in full_path_of:
         if 'DetailView' in file_name or 'Detail' in file_name:
             nav_pattern_files.append(file_name)
     
@@ -174,9 +257,9 @@ def analyze_dependencies():
     
     # Check if they use ID-based or object-based navigation
     for detail_view in nav_pattern_files[:5]:  # Check first 5
-        if detail_view in file_locations:
+        if detail_view in full_path_of:
             try:
-                with open(file_locations[detail_view]['full_path'], 'r') as f:
+                with open(full_path_of[detail_view], 'r') as f:
                     content = f.read()
                 
                 # Check for ID-based pattern
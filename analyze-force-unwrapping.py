@@ -1,83 +1,130 @@
 #!/usr/bin/env python3
 import os
 import re
+import mmap
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import json
 
-def find_force_unwrapping(file_path):
-    """Find force unwrapping patterns in a Swift file."""
-    patterns = []
-    
-    # Patterns to match force unwrapping
-    force_unwrap_patterns = [
-        (r'[a-zA-Z_]\w*!(?![\w=])', 'variable!'),
-        (r'!\.[a-zA-Z_]', '!.property'),
-        (r'!\[', '![index]'),
-        (r'as!\s+\w+', 'as! cast'),
-        (r'try!\s+', 'try!'),
-        (r'\]!', ']!'),
-        (r'\)!', ')!'),
-    ]
-    
-    # Patterns to exclude (legitimate uses)
-    exclude_patterns = [
-        r'@IBOutlet',
-        r'@State\s+\w+:',
-        r'XCTAssert',
-        r'fatalError',
-        r'precondition',
-        r'assert',
-        r'//.*!',  # Comments
-        r'"[^"]*![^"]*"',  # Inside strings
-        r"'[^']*![^']*'",  # Inside single quotes
-    ]
-    
+# Below this many files, starting worker processes costs more than it saves
+MIN_PARALLEL_FILES = 64
+
+# Patterns to match force unwrapping, one named group per type. Checked in a
+# single pass, so each `!` is reported once under the first type matching it.
+FORCE_UNWRAP_RE = re.compile('|'.join([
+    r'(?P<cast>as!\s+\w+)',
+    r'(?P<try>try!\s+)',
+    r'(?P<variable>[a-zA-Z_]\w*!(?![\w=]))',
+    r'(?P<property>!\.[a-zA-Z_])',
+    r'(?P<index>!\[)',
+    r'(?P<bracket>\]!)',
+    r'(?P<paren>\)!)',
+]))
+
+FORCE_UNWRAP_TYPES = {
+    'cast': 'as! cast',
+    'try': 'try!',
+    'variable': 'variable!',
+    'property': '!.property',
+    'index': '![index]',
+    'bracket': ']!',
+    'paren': ')!',
+}
+
+# Patterns to exclude (legitimate uses)
+EXCLUDE_RE = re.compile('|'.join([
+    r'@IBOutlet',
+    r'@State\s+\w+:',
+    r'XCTAssert',
+    r'fatalError',
+    r'precondition',
+    r'assert',
+    r'//.*!',  # Comments
+    r'"[^"]*![^"]*"',  # Inside strings
+    r"'[^']*![^']*'",  # Inside single quotes
+]))
+
+def scan_force_unwrapping(lines):
+    """Find force unwrapping patterns in the lines of a Swift source."""
     violations = []
     
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+    for line_num, line in enumerate(lines, 1):
+        # Every pattern needs a '!'; most lines have none
+        if '!' not in line:
+            continue
+        
+        # Skip if line contains exclude patterns
+        if EXCLUDE_RE.search(line):
+            continue
             
-        for line_num, line in enumerate(lines, 1):
-            # Skip if line contains exclude patterns
-            if any(re.search(pattern, line) for pattern in exclude_patterns):
-                continue
-                
-            # Check for force unwrapping patterns
-            for pattern, pattern_type in force_unwrap_patterns:
-                matches = re.finditer(pattern, line)
-                for match in matches:
-                    violations.append({
-                        'line': line_num,
-                        'type': pattern_type,
-                        'code': line.strip(),
-                        'match': match.group()
-                    })
-    except Exception as e:
-        print(f"Error reading {file_path}: {e}")
+        # Check for force unwrapping patterns
+        for match in FORCE_UNWRAP_RE.finditer(line):
+            violations.append({
+                'line': line_num,
+                'type': FORCE_UNWRAP_TYPES[match.lastgroup],
+                'code': line.strip(),
+                'match': match.group()
+            })
         
     return violations
 
+def mapped_lines(mm):
+    """Iterate the lines of a memory-mapped file, decoding only lines containing '!'."""
+    for raw in iter(mm.readline, b''):
+        yield raw.decode('utf-8', 'replace') if b'!' in raw else ''
+
+def find_force_unwrapping(file_path):
+    """Find force unwrapping patterns in a Swift file."""
+    try:
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return scan_force_unwrapping(mapped_lines(mm))
+    except Exception as e:
+        print(f"Error reading {file_path}: {e}")
+        return []
+
+def walk_swift(root, skip=frozenset({'.build', 'DerivedData', '.git'})):
+    """Yield Swift file paths under root in os.walk order, pruning skipped directories."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in skip:
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith('.swift'):
+                        yield entry.path
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
 def analyze_project(root_dir):
     """Analyze all Swift files in the project."""
     results = defaultdict(list)
-    file_count = 0
     total_violations = 0
     
-    for root, dirs, files in os.walk(root_dir):
-        # Skip build directories
-        dirs[:] = [d for d in dirs if d not in ['.build', 'DerivedData', '.git']]
-        
-        for file in files:
-            if file.endswith('.swift'):
-                file_path = os.path.join(root, file)
-                file_count += 1
-                
-                violations = find_force_unwrapping(file_path)
-                if violations:
-                    rel_path = os.path.relpath(file_path, root_dir)
-                    results[rel_path] = violations
-                    total_violations += len(violations)
+    # Collect Swift files, skipping build directories
+    file_paths = list(walk_swift(root_dir))
+    file_count = len(file_paths)
+    
+    # Files are independent, so scan them across worker processes
+    if file_count < MIN_PARALLEL_FILES:
+        all_violations = map(find_force_unwrapping, file_paths)
+    else:
+        chunksize = min(64, max(1, file_count // (4 * (os.cpu_count() or 1))))
+        with ProcessPoolExecutor() as executor:
+            all_violations = list(executor.map(find_force_unwrapping, file_paths, chunksize=chunksize))
+    
+    for file_path, violations in zip(file_paths, all_violations):
+        if violations:
+            rel_path = os.path.relpath(file_path, root_dir)
+            results[rel_path] = violations
+            total_violations += len(violations)
     
     return results, file_count, total_violations
 
@@ -86,7 +133,10 @@ def main():
     print("Analyzing force unwrapping in Swift files...")
     
     results, file_count, total_violations = analyze_project(root_dir)
-    
+    report(results, file_count, total_violations)
+
+def report(results, file_count, total_violations):
+    """Print the summary and save the detailed JSON report."""
     # Sort by number of violations
     sorted_results = sorted(results.items(), key=lambda x: len(x[1]), reverse=True)
     
@@ -119,17 +169,18 @@ def main():
     for vtype, count in sorted(type_count.items(), key=lambda x: x[1], reverse=True):
         print(f"  {vtype}: {count}")
     
-    # Save detailed results
-    with open('force-unwrapping-report.json', 'w') as f:
-        json.dump({
-            'summary': {
-                'files_analyzed': file_count,
-                'files_with_violations': len(results),
-                'total_violations': total_violations,
-                'violations_by_type': dict(type_count)
-            },
-            'files': dict(sorted_results)
-        }, f, indent=2)
+    # Save detailed results, serialized in one go and written once
+    report_json = json.dumps({
+        'summary': {
+            'files_analyzed': file_count,
+            'files_with_violations': len(results),
+            'total_violations': total_violations,
+            'violations_by_type': dict(type_count)
+        },
+        'files': dict(sorted_results)
+    }, indent=2)
+    with open('force-unwrapping-report.json', 'w', buffering=1 << 20) as f:
+        f.write(report_json)
     
     print("\nDetailed report saved to force-unwrapping-report.json")
 
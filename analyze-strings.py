@@ -8,13 +8,69 @@ Identifies duplicates and unique strings for consolidation
 import os
 import re
 from collections import defaultdict, Counter
-from pathlib import Path
 import json
 
+# Pattern to match quoted strings (a string never spans lines)
+STRING_RE = re.compile(r'"([^"\n]+)"')
+
+# Comment lines and lines containing any of these are not UI text
+SKIP_LINE_RE = re.compile(
+    r'^\s*//|AppStrings\.|#if DEBUG|print\(|Logger\(|(?:category|subsystem|identifier|forKey):|NSLocalizedString'
+)
+
+def find_strings(content):
+    """Return (string, line_num) for each candidate UI string in a Swift source"""
+    found = []
+    line_num = 1
+    line_start = -1  # Start of the line last checked for exclusions
+    skip_line = False
+    
+    # Scan the whole file at once; line checks only run for lines with strings
+    for m in STRING_RE.finditer(content):
+        start = content.rfind('\n', 0, m.start()) + 1
+        if start != line_start:
+            line_num += content.count('\n', max(line_start, 0), start)
+            line_start = start
+            end = content.find('\n', start)
+            line = content[start:] if end == -1 else content[start:end]
+            
+            # Skip comments and specific patterns
+            skip_line = SKIP_LINE_RE.search(line) is not None
+        
+        if skip_line:
+            continue
+        
+        match = m.group(1)
+        # Filter out non-UI strings
+        if (len(match) >= 2 and  # At least 2 chars
+            not match.startswith('_') and  # Not internal
+            not match.isupper() and  # Not constants
+            not match.startswith('com.') and  # Not bundle IDs
+            not match.startswith('http') and  # Not URLs
+            not match.endswith('.swift') and  # Not filenames
+            not match.endswith('.json') and  # Not filenames
+            not match.count('.') > 2 and  # Not key paths
+            not (match.isascii() and match.isdigit())):  # Not just numbers
+            
+            found.append((match, line_num))
+                
+    return found
+
+# Consolidation categories and the (lowercase) keywords that put a string in them
+SUGGESTION_CATEGORIES = [
+    ("Error Messages", re.compile(r'error|failed')),
+    ("Button Titles", re.compile(r'add|save|delete|cancel|ok|done|edit|update')),
+    ("Status Messages", re.compile(r'loading|saving|updating|fetching|syncing')),
+    ("Empty States", re.compile(r'no |empty|none|not found')),
+]
+
 class StringAnalyzer:
     def __init__(self, project_root):
-        self.project_root = Path(project_root)
-        self.strings = defaultdict(list)  # string -> [(file, line_num)]
+        self.project_root = os.fspath(project_root)
+        self.root_prefix = os.path.join(self.project_root, '')  # Sliced off walked paths
+        self.strings = defaultdict(list)  # string -> [(file_id, line_num)]
+        self.file_paths = []  # file_id -> relative path
+        self.file_ids = {}  # relative path -> file_id
         self.string_counts = Counter()
         self.excluded_files = {
             'FirebaseManager.swift',
@@ -44,62 +100,52 @@ class StringAnalyzer:
         """Collect all Swift files excluding protected ones"""
         swift_files = []
         exclude_dirs = {'DerivedData', '.build', 'Pods', '.git'}
+        stack = [self.project_root]
         
-        for root, dirs, files in os.walk(self.project_root):
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
-            
-            for file in files:
-                if file.endswith('.swift') and file not in self.excluded_files:
-                    swift_files.append(Path(root) / file)
+        # Iterative scandir walk: DirEntry type checks avoid a stat per entry
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in exclude_dirs:
+                                stack.append(entry.path)
+                        elif entry.name.endswith('.swift') and entry.name not in self.excluded_files:
+                            swift_files.append(entry.path)
+            except OSError:
+                continue
                     
-        return sorted(swift_files)
+        # Component-wise, as paths sort
+        return sorted(swift_files, key=lambda path: path.split(os.sep))
     
     def extract_strings(self, file_path):
         """Extract hardcoded strings from a Swift file"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
-                lines = content.split('\n')
                 
-            relative_path = file_path.relative_to(self.project_root)
-            
-            # Pattern to match quoted strings
-            string_pattern = r'"([^"]+)"'
-            
-            for i, line in enumerate(lines, 1):
-                # Skip comments and specific patterns
-                if (line.strip().startswith('//') or 
-                    'AppStrings.' in line or
-                    '#if DEBUG' in line or
-                    'print(' in line or
-                    'Logger(' in line or
-                    'category:' in line or
-                    'subsystem:' in line or
-                    'identifier:' in line or
-                    'forKey:' in line or
-                    'NSLocalizedString' in line):
-                    continue
-                
-                # Find all strings in the line
-                matches = re.findall(string_pattern, line)
-                for match in matches:
-                    # Filter out non-UI strings
-                    if (len(match) >= 2 and  # At least 2 chars
-                        not match.startswith('_') and  # Not internal
-                        not match.isupper() and  # Not constants
-                        not match.startswith('com.') and  # Not bundle IDs
-                        not match.startswith('http') and  # Not URLs
-                        not match.endswith('.swift') and  # Not filenames
-                        not match.endswith('.json') and  # Not filenames
-                        not match.count('.') > 2 and  # Not key paths
-                        not re.match(r'^[0-9]+$', match)):  # Not just numbers
-                        
-                        self.strings[match].append((str(relative_path), i))
-                        self.string_counts[match] += 1
+            relative_path = file_path[len(self.root_prefix):]
+            self.add_strings(relative_path, find_strings(content))
                         
         except Exception as e:
             print(f"Error processing {file_path}: {e}")
     
+    def add_strings(self, relative_path, found):
+        """Record (string, line_num) hits found in one file"""
+        # Counter.update tallies the whole file's hits in C
+        self.string_counts.update(match for match, _ in found)
+        
+        # Locations refer to the file by id rather than repeating its path
+        file_id = self.file_ids.get(relative_path)
+        if file_id is None:
+            file_id = self.file_ids[relative_path] = len(self.file_paths)
+            self.file_paths.append(relative_path)
+        
+        strings = self.strings
+        for match, i in found:
+            strings[match].append((file_id, i))
+    
     def analyze_results(self):
         """Analyze and report on collected strings"""
         # Sort strings by frequency
@@ -172,7 +218,7 @@ class StringAnalyzer:
         
         # Add duplicate details
         for string, count in duplicates[:50]:  # Top 50 duplicates
-            locations = self.strings[string][:5]  # First 5 locations
+            locations = [(self.file_paths[file_id], i) for file_id, i in self.strings[string][:5]]  # First 5 locations
             report['duplicates'][string] = {
                 'count': count,
                 'sample_locations': locations
@@ -181,15 +227,15 @@ class StringAnalyzer:
         # Files with most strings
         file_string_counts = Counter()
         for locations in self.strings.values():
-            for file, _ in locations:
-                file_string_counts[file] += 1
+            file_string_counts.update(file_id for file_id, _ in locations)
         
-        for file, count in file_string_counts.most_common(20):
-            report['files_with_most_strings'][file] = count
+        for file_id, count in file_string_counts.most_common(20):
+            report['files_with_most_strings'][self.file_paths[file_id]] = count
         
-        # Save report
-        with open('string-analysis-report.json', 'w') as f:
-            json.dump(report, f, indent=2)
+        # Save report, serialized in one go and written once
+        report_json = json.dumps(report, indent=2)
+        with open('string-analysis-report.json', 'w', buffering=1 << 20) as f:
+            f.write(report_json)
         
         print(f"\n📄 Detailed report saved to: string-analysis-report.json")
         
@@ -201,27 +247,16 @@ class StringAnalyzer:
         print("\n🎯 String Consolidation Suggestions:")
         print("=" * 60)
         
-        suggestions = []
-        
-        # 1. Error messages
-        error_strings = [s for s in self.string_counts.keys() if 'error' in s.lower() or 'failed' in s.lower()]
-        if error_strings:
-            suggestions.append(("Error Messages", error_strings[:10]))
-        
-        # 2. Button titles
-        button_strings = [s for s in self.string_counts.keys() if any(word in s.lower() for word in ['add', 'save', 'delete', 'cancel', 'ok', 'done', 'edit', 'update'])]
-        if button_strings:
-            suggestions.append(("Button Titles", button_strings[:10]))
-        
-        # 3. Loading/Status messages
-        status_strings = [s for s in self.string_counts.keys() if any(word in s.lower() for word in ['loading', 'saving', 'updating', 'fetching', 'syncing'])]
-        if status_strings:
-            suggestions.append(("Status Messages", status_strings[:10]))
+        # One pass over the strings, lowercasing each once
+        buckets = {category: [] for category, _ in SUGGESTION_CATEGORIES}
+        for s in self.string_counts:
+            s_lower = s.lower()
+            for category, keywords in SUGGESTION_CATEGORIES:
+                bucket = buckets[category]
+                if len(bucket) < 10 and keywords.search(s_lower):
+                    bucket.append(s)
         
-        # 4. Empty state messages
-        empty_strings = [s for s in self.string_counts.keys() if any(word in s.lower() for word in ['no ', 'empty', 'none', 'not found'])]
-        if empty_strings:
-            suggestions.append(("Empty States", empty_strings[:10]))
+        suggestions = [(category, strings) for category, strings in buckets.items() if strings]
         
         for category, strings in suggestions:
             print(f"\n{category}:")
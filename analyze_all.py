@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+
+"""
+Run the dependency, force-unwrapping and hardcoded-string analyzers together
+Walks the project once and reads each Swift file once, feeding the same
+content to all three analyzers, then prints/saves their usual reports
+"""
+
+import os
+import sys
+import json
+import hashlib
+import sqlite3
+import importlib.util
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Directories that none of the analyzers look into
+EXCLUDE_DIRS = {'.build', 'DerivedData', '.git'}
+
+# App sources (relative to the project root) used for the dependency analysis
+SOURCE_DIR = 'MedicationManager'
+
+# Per-file results are cached across runs, keyed by file content
+CACHE_FILE = '.swift_analysis_cache.db'
+ANALYZER_SCRIPTS = ('analyze-circular-deps.py', 'analyze-force-unwrapping.py', 'analyze-strings.py')
+
+# Below this many files to analyze, starting worker processes costs more than it saves
+MIN_PARALLEL_FILES = 64
+
+def load_script(name, filename):
+    """Load one of the standalone analyzer scripts as a module"""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(SCRIPT_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+deps = load_script('dependency_analyzer', 'analyze-circular-deps.py')
+unwraps = load_script('force_unwrap_analyzer', 'analyze-force-unwrapping.py')
+strings = load_script('string_analyzer', 'analyze-strings.py')
+
+def analyzers_digest():
+    """Hash the analyzer scripts so cached results are dropped when they change"""
+    digest = hashlib.sha256()
+    for filename in ANALYZER_SCRIPTS + (os.path.basename(__file__),):
+        with open(os.path.join(SCRIPT_DIR, filename), 'rb') as f:
+            digest.update(f.read())
+    return digest.digest()
+
+def open_cache(path):
+    """Open the per-file results cache, creating it if needed"""
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE IF NOT EXISTS c('
+                 'path TEXT PRIMARY KEY, sha BLOB, deps TEXT, viols TEXT, strs TEXT)')
+    return conn
+
+def collect_swift_files(root):
+    """Collect every Swift file under root as a path relative to root, sorted"""
+    swift_files = []
+    stack = [root]
+
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in EXCLUDE_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name.endswith('.swift'):
+                        swift_files.append(os.path.relpath(entry.path, root))
+        except OSError:
+            continue
+
+    return sorted(swift_files, key=lambda path: path.split(os.sep))
+
+def process(raw):
+    """Run all three analyzers over one file's raw bytes"""
+    # Same newline handling as reading in text mode
+    content = raw.decode('utf-8', 'replace')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+
+    return (sorted(deps.find_dependencies(content)),
+            unwraps.scan_force_unwrapping(content.split('\n')),
+            strings.find_strings(content))
+
+def map_files(func, items):
+    """Map func over per-file items, across worker processes for larger batches"""
+    if len(items) < MIN_PARALLEL_FILES:
+        return list(map(func, items))
+
+    chunksize = min(64, max(1, len(items) // (4 * (os.cpu_count() or 1))))
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
+
+def analyze_all(root):
+    """Analyze every Swift file under root and print all three reports"""
+    swift_files = collect_swift_files(root)
+    source_prefix = SOURCE_DIR + os.sep
+
+    # Per-analyzer state, in the shape each report expects
+    dependencies = defaultdict(set)
+    layer_of = {}
+    path_of = {}
+    full_path_of = {}
+    unwrap_results = {}
+    total_violations = 0
+    string_analyzer = strings.StringAnalyzer(root)
+
+    cache = open_cache(os.path.join(root, CACHE_FILE))
+    cached = {row[0]: row[1:] for row in cache.execute('SELECT path, sha, deps, viols, strs FROM c')}
+    updates = []
+    salt = analyzers_digest()
+
+    results = {}
+    pending = []
+
+    for rel_path in swift_files:
+        full_path = os.path.join(root, rel_path)
+        try:
+            with open(full_path, 'rb', buffering=1 << 20) as f:
+                raw = f.read()
+        except Exception as e:
+            print(f"Error reading {full_path}: {e}")
+            continue
+
+        sha = hashlib.sha256(salt + raw).digest()
+        entry = cached.get(rel_path)
+        if entry and entry[0] == sha:
+            results[rel_path] = (json.loads(entry[1]), json.loads(entry[2]),
+                                 [tuple(hit) for hit in json.loads(entry[3])])
+        else:
+            pending.append((rel_path, sha, raw))
+
+    # Analyze new and changed files
+    for (rel_path, sha, _), result in zip(pending, map_files(process, [raw for _, _, raw in pending])):
+        results[rel_path] = result
+        updates.append((rel_path, sha) + tuple(json.dumps(part) for part in result))
+
+    for rel_path in swift_files:
+        if rel_path not in results:
+            continue
+        found, violations, hits = results[rel_path]
+        full_path = os.path.join(root, rel_path)
+        parts = rel_path.split(os.sep)
+
+        # Dependency analysis covers app sources outside test/build directories
+        if rel_path.startswith(source_prefix) and not any(
+                fragment in part for part in parts[1:-1] for fragment in deps.SKIP_DIRS):
+            file_name = os.path.splitext(parts[-1])[0]
+            layer_of[file_name] = parts[1]
+            path_of[file_name] = rel_path[len(source_prefix):]
+            full_path_of[file_name] = full_path
+            if found:
+                dependencies[file_name].update(found)
+
+        if violations:
+            unwrap_results[rel_path] = violations
+            total_violations += len(violations)
+
+        # The string analyzer skips protected files and CocoaPods sources
+        if parts[-1] not in string_analyzer.excluded_files and 'Pods' not in parts:
+            string_analyzer.add_strings(rel_path, hits)
+
+    # Store all new results in a single transaction
+    with cache:
+        cache.executemany('INSERT OR REPLACE INTO c VALUES (?, ?, ?, ?, ?)', updates)
+    cache.close()
+
+    deps.report_dependencies(dependencies, layer_of, path_of, full_path_of)
+    print()
+    unwraps.report(unwrap_results, len(swift_files), total_violations)
+    print()
+    string_analyzer.analyze_results()
+
+def main():
+    root = sys.argv[1] if len(sys.argv) > 1 else '.'
+    analyze_all(root)
+
+if __name__ == '__main__':
+    main()
@@ -5,79 +5,119 @@ import re
 from collections import defaultdict
 import json
 
-def extract_imports(file_path):
-    """Extract import statements from a Swift file."""
+# Import statements (this also covers `@testable import`)
+IMPORT_RE = re.compile(r'import\s+(\w+)')
+
+# Property declarations with specific types
+# e.g., @StateObject private var navigationManager = NavigationManager.shared
+PROPERTY_RE = re.compile(r'(?:var|let)\s+\w+\s*[:=]\s*(\w+)(?:\.shared|\.init|\()?')
+
+# Type annotations
+TYPE_ANNOTATION_RE = re.compile(r':\s*(\w+)(?:<|>|\s|$)')
+
+# Function parameters and return types
+FUNC_RE = re.compile(r'func\s+\w+.*?(?:->|:)\s*(\w+)')
+
+def extract_symbols(file_path):
+    """Extract import statements and referenced type names from a Swift file in one read."""
     imports = set()
+    references = set()
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
-            
-            # Match import statements
-            import_pattern = r'import\s+(\w+)'
-            for match in re.finditer(import_pattern, content):
-                imports.add(match.group(1))
-            
-            # Also look for @testable imports
-            testable_pattern = r'@testable\s+import\s+(\w+)'
-            for match in re.finditer(testable_pattern, content):
-                imports.add(match.group(1))
-                
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
+        return imports, references
     
-    return imports
-
-def extract_type_references(file_path):
-    """Extract type references that might indicate dependencies."""
-    references = set()
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-            # Look for property declarations with specific types
-            # e.g., @StateObject private var navigationManager = NavigationManager.shared
-            property_pattern = r'(?:var|let)\s+\w+\s*[:=]\s*(\w+)(?:\.shared|\.init|\()?'
-            for match in re.finditer(property_pattern, content):
-                type_name = match.group(1)
-                if type_name[0].isupper():  # Likely a type name
-                    references.add(type_name)
-            
-            # Look for type annotations
-            type_annotation_pattern = r':\s*(\w+)(?:<|>|\s|$)'
-            for match in re.finditer(type_annotation_pattern, content):
-                type_name = match.group(1)
-                if type_name[0].isupper():
-                    references.add(type_name)
-            
-            # Look for function parameters and return types
-            func_pattern = r'func\s+\w+.*?(?:->|:)\s*(\w+)'
-            for match in re.finditer(func_pattern, content):
-                type_name = match.group(1)
-                if type_name[0].isupper():
-                    references.add(type_name)
-                    
-    except Exception as e:
-        print(f"Error analyzing {file_path}: {e}")
+    imports.update(match.group(1) for match in IMPORT_RE.finditer(content))
     
-    return references
+    # Capitalized names are likely type names
+    for regex in (PROPERTY_RE, TYPE_ANNOTATION_RE, FUNC_RE):
+        for match in regex.finditer(content):
+            type_name = match.group(1)
+            if type_name[0].isupper():
+                references.add(type_name)
+    
+    return imports, references
 
 def get_file_name_without_extension(path):
     """Get the file name without extension."""
     return os.path.splitext(os.path.basename(path))[0]
 
+def walk_swift(root):
+    """Yield Swift file paths under root in os.walk order, skipping hidden files."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.endswith('.swift') and not entry.name.startswith('.'):
+                        yield entry.path
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+def strongly_connected_components(graph):
+    """Find the strongly connected components of a dependency graph (iterative Tarjan)."""
+    index = {}
+    lowlink = {}
+    stack = []
+    on_stack = set()
+    components = []
+    
+    for root in graph:
+        if root in index:
+            continue
+        
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph.get(root, ())))]
+        
+        while work:
+            node, successors = work[-1]
+            for succ in successors:
+                if succ not in index:
+                    # Descend into an unvisited successor
+                    index[succ] = lowlink[succ] = len(index)
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(graph.get(succ, ()))))
+                    break
+                if succ in on_stack:
+                    lowlink[node] = min(lowlink[node], index[succ])
+            else:
+                # All successors done: propagate lowlink and pop a finished component
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    
+    return components
+
 def find_circular_dependencies(root_dir):
     """Find circular dependencies in Swift files."""
     # First, build a map of all Swift files
     swift_files = []
     file_to_path = {}
     
-    for dirpath, _, filenames in os.walk(root_dir):
-        for filename in filenames:
-            if filename.endswith('.swift') and not filename.startswith('.'):
-                file_path = os.path.join(dirpath, filename)
-                swift_files.append(file_path)
-                file_name = get_file_name_without_extension(file_path)
-                file_to_path[file_name] = file_path
+    for file_path in walk_swift(root_dir):
+        swift_files.append(file_path)
+        file_name = get_file_name_without_extension(file_path)
+        file_to_path[file_name] = file_path
     
     # Build dependency graph
     dependencies = defaultdict(set)
@@ -86,8 +126,7 @@ def find_circular_dependencies(root_dir):
     
     for file_path in swift_files:
         file_name = get_file_name_without_extension(file_path)
-        imports = extract_imports(file_path)
-        references = extract_type_references(file_path)
+        imports, references = extract_symbols(file_path)
         
         imports_map[file_name] = imports
         references_map[file_name] = references
@@ -118,41 +157,52 @@ def find_circular_dependencies(root_dir):
                         }
                     })
     
+    # Files can only share a cycle if they are in the same strongly connected component
+    components = [sorted(c) for c in strongly_connected_components(dependencies) if len(c) > 1]
+    
     # Find longer circular dependency chains
-    def find_cycles_from(start, current, path, visited):
-        if len(path) > 10:  # Prevent infinite loops
-            return []
-        
-        cycles = []
-        for next_node in dependencies.get(current, set()):
-            if next_node == start and len(path) > 2:
-                # Found a cycle
-                cycles.append(path + [next_node])
-            elif next_node not in visited:
-                visited.add(next_node)
-                cycles.extend(find_cycles_from(start, next_node, path + [next_node], visited.copy()))
+    def cycles_from(start, allowed):
+        """Yield each cycle through start whose other files are all in allowed."""
+        path = [start]
+        on_path = {start}
+        stack = [iter(dependencies.get(start, ()))]
         
-        return cycles
-    
-    # Look for cycles of length > 2
+        # Iterative DFS: one shared path set, updated as nodes are entered and left
+        while stack:
+            next_node = next(stack[-1], None)
+            if next_node is None:
+                stack.pop()
+                on_path.discard(path.pop())
+            elif next_node == start:
+                if len(path) > 2:
+                    yield path[:]
+            elif next_node in allowed and next_node not in on_path:
+                on_path.add(next_node)
+                path.append(next_node)
+                stack.append(iter(dependencies.get(next_node, ())))
+    
+    # Look for cycles of length > 2, each found once from its smallest file
     longer_cycles = []
     checked_cycles = set()
     
-    for start_node in dependencies:
-        cycles = find_cycles_from(start_node, start_node, [start_node], {start_node})
-        for cycle in cycles:
-            cycle_key = tuple(sorted(cycle[:-1]))  # Remove duplicate start node
-            if cycle_key not in checked_cycles and len(cycle_key) > 2:
-                checked_cycles.add(cycle_key)
-                longer_cycles.append({
-                    'files': list(cycle_key),
-                    'cycle_path': cycle[:-1],
-                    'paths': [file_to_path.get(f, 'Unknown') for f in cycle_key]
-                })
+    for component in components:
+        if len(component) < 3:
+            continue
+        for i, start_node in enumerate(component):
+            for cycle in cycles_from(start_node, set(component[i + 1:])):
+                cycle_key = tuple(sorted(cycle))
+                if cycle_key not in checked_cycles:
+                    checked_cycles.add(cycle_key)
+                    longer_cycles.append({
+                        'files': list(cycle_key),
+                        'cycle_path': cycle,
+                        'paths': [file_to_path.get(f, 'Unknown') for f in cycle_key]
+                    })
     
     return {
         'circular_dependencies': circular_deps,
         'longer_cycles': longer_cycles,
+        'strongly_connected_components': components,
         'dependency_graph': {k: list(v) for k, v in dependencies.items() if v},
         'total_files_analyzed': len(swift_files)
     }
@@ -180,6 +230,12 @@ def main():
     else:
         print("No direct circular dependencies found.\n")
     
+    if results['strongly_connected_components']:
+        print(f"\nFound {len(results['strongly_connected_components'])} groups of mutually dependent files:\n")
+        for i, component in enumerate(results['strongly_connected_components'], 1):
+            print(f"{i}. {', '.join(component)}")
+        print()
+    
     if results['longer_cycles']:
         print(f"\nFound {len(results['longer_cycles'])} longer circular dependency chains:\n")
         for i, cycle in enumerate(results['longer_cycles'], 1):
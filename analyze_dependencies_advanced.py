@@ -2,160 +2,296 @@
 
 import os
 import re
+import mmap
+from contextlib import nullcontext
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import json
 
+# Below this many files, starting worker processes costs more than it saves
+MIN_PARALLEL_FILES = 64
+
+# Declaration and dependency patterns, compiled once; they run over the raw
+# bytes of the file, so names are ASCII identifiers
+CLASS_RE = re.compile(rb'(?:@\w+\s+)*(?:public\s+|private\s+|internal\s+|open\s+|final\s+)*class\s+(\w+)')
+STRUCT_RE = re.compile(rb'(?:@\w+\s+)*(?:public\s+|private\s+|internal\s+)?struct\s+(\w+)')
+IMPORT_RE = re.compile(rb'import\s+(\w+)')
+SINGLETON_RE = re.compile(rb'(?<!\w)([A-Z]\w*)\.shared')
+PROPERTY_RE = re.compile(rb'(?:private\s+)?(?:let|var)\s+\w+\s*[:=]\s*([A-Z]\w*)(?:\.shared|\(\))?')
+TYPE_RE = re.compile(rb':\s*(\w+Manager)')
+
+# Managers referenced by name
+MANAGERS = ('FirebaseManager', 'CoreDataManager', 'DataSyncManager',
+            'AnalyticsManager', 'NavigationManager', 'SpeechManager',
+            'ConflictDetectionManager', 'UserModeManager', 'VoiceInteractionManager')
+
+# Directories that hold no app sources
+SKIP_DIRS = {'Pods', '.build', 'DerivedData', '.git'}
+
+def map_file(f):
+    """Memory-map an open file for reading; an empty file, which cannot be mapped, reads as b''."""
+    if os.fstat(f.fileno()).st_size == 0:
+        return nullcontext(b'')
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
 def extract_class_info(file_path):
     """Extract class name and its dependencies from a Swift file."""
+    try:
+        # Scan the mapped file directly rather than reading and decoding it
+        with open(file_path, 'rb') as f, map_file(f) as content:
+            return parse_class_info(content)
+    except Exception as e:
+        print(f"Error analyzing {file_path}: {e}")
+        return None, set(), set()
+
+def parse_class_info(content):
+    """Extract class name, dependencies and imports from the bytes of a Swift source."""
     class_name = None
     dependencies = set()
     imports = set()
     
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-            # Find class declaration
-            class_pattern = r'(?:@\w+\s+)*(?:public\s+|private\s+|internal\s+|open\s+|final\s+)*class\s+(\w+)'
-            class_match = re.search(class_pattern, content)
-            if class_match:
-                class_name = class_match.group(1)
-            
-            # Find struct declaration if no class found
-            if not class_name:
-                struct_pattern = r'(?:@\w+\s+)*(?:public\s+|private\s+|internal\s+)?struct\s+(\w+)'
-                struct_match = re.search(struct_pattern, content)
-                if struct_match:
-                    class_name = struct_match.group(1)
-            
-            # Extract imports
-            import_pattern = r'import\s+(\w+)'
-            for match in re.finditer(import_pattern, content):
-                imports.add(match.group(1))
-            
-            # Look for singleton patterns (shared instances)
-            singleton_pattern = r'(\w+)\.shared'
-            for match in re.finditer(singleton_pattern, content):
-                dep = match.group(1)
-                if dep != class_name and dep[0].isupper():
-                    dependencies.add(dep)
-            
-            # Look for property declarations with manager types
-            property_pattern = r'(?:private\s+)?(?:let|var)\s+\w+\s*[:=]\s*(\w+)(?:\.shared|\(\))?'
-            for match in re.finditer(property_pattern, content):
-                dep = match.group(1)
-                if dep != class_name and dep[0].isupper() and 'Manager' in dep:
-                    dependencies.add(dep)
-            
-            # Look for type annotations
-            type_pattern = r':\s*(\w+Manager)'
-            for match in re.finditer(type_pattern, content):
-                dep = match.group(1)
-                if dep != class_name:
-                    dependencies.add(dep)
-            
-            # Look for NavigationManager usage
-            if 'NavigationManager' in content and class_name != 'NavigationManager':
-                dependencies.add('NavigationManager')
-            
-            # Look for specific manager references
-            managers = ['FirebaseManager', 'CoreDataManager', 'DataSyncManager', 
-                       'AnalyticsManager', 'NavigationManager', 'SpeechManager',
-                       'ConflictDetectionManager', 'UserModeManager', 'VoiceInteractionManager']
-            for manager in managers:
-                if manager in content and class_name != manager:
-                    dependencies.add(manager)
-                    
-    except Exception as e:
-        print(f"Error analyzing {file_path}: {e}")
+    # Find class declaration
+    class_match = CLASS_RE.search(content)
+    if class_match:
+        class_name = class_match.group(1).decode()
+    
+    # Find struct declaration if no class found
+    if not class_name:
+        struct_match = STRUCT_RE.search(content)
+        if struct_match:
+            class_name = struct_match.group(1).decode()
+    
+    # Extract imports
+    for match in IMPORT_RE.finditer(content):
+        imports.add(match.group(1).decode())
+    
+    # Look for singleton patterns (shared instances)
+    for match in SINGLETON_RE.finditer(content):
+        dep = match.group(1).decode()
+        if dep != class_name:
+            dependencies.add(dep)
+    
+    # The remaining dependencies all name a Manager; files that never
+    # mention one skip those scans
+    if content.find(b'Manager') == -1:
+        return class_name, dependencies, imports
+    
+    # Look for property declarations with manager types
+    for match in PROPERTY_RE.finditer(content):
+        dep = match.group(1).decode()
+        if dep != class_name and 'Manager' in dep:
+            dependencies.add(dep)
+    
+    # Look for type annotations
+    for match in TYPE_RE.finditer(content):
+        dep = match.group(1).decode()
+        if dep != class_name:
+            dependencies.add(dep)
+    
+    # Look for specific manager references (NavigationManager included),
+    # skipping managers the scans above already found
+    for manager in MANAGERS:
+        if manager not in dependencies and manager != class_name and content.find(manager.encode()) != -1:
+            dependencies.add(manager)
     
     return class_name, dependencies, imports
 
-def find_manager_circular_dependencies(root_dir):
+def collect_swift_targets(root_dir):
+    """Walk root_dir once, returning the Manager, ViewModel and View file paths in os.walk order."""
+    manager_paths = []
+    viewmodel_paths = []
+    view_paths = []
+    stack = [root_dir]
+    
+    while stack:
+        directory = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            subdirs.append(entry.path)
+                        continue
+                    
+                    filename = entry.name
+                    if filename.endswith('.swift') and 'Manager' in filename:
+                        manager_paths.append(entry.path)
+                    if filename.endswith('ViewModel.swift'):
+                        viewmodel_paths.append(entry.path)
+                    if filename.endswith('View.swift'):
+                        view_paths.append(entry.path)
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+    
+    return manager_paths, viewmodel_paths, view_paths
+
+def strongly_connected_components(graph):
+    """Find the strongly connected components of a graph given as successor lists by node id (iterative Tarjan)."""
+    index = [-1] * len(graph)
+    lowlink = [0] * len(graph)
+    on_stack = [False] * len(graph)
+    stack = []
+    components = []
+    visited = 0
+    
+    for root in range(len(graph)):
+        if index[root] >= 0:
+            continue
+        
+        index[root] = lowlink[root] = visited
+        visited += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, iter(graph[root]))]
+        
+        while work:
+            node, successors = work[-1]
+            for succ in successors:
+                if index[succ] < 0:
+                    # Descend into an unvisited successor
+                    index[succ] = lowlink[succ] = visited
+                    visited += 1
+                    stack.append(succ)
+                    on_stack[succ] = True
+                    work.append((succ, iter(graph[succ])))
+                    break
+                if on_stack[succ]:
+                    lowlink[node] = min(lowlink[node], index[succ])
+            else:
+                # All successors done: propagate lowlink and pop a finished component
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    
+    return components
+
+def find_manager_circular_dependencies(manager_paths, viewmodel_paths):
     """Find circular dependencies specifically focusing on Manager classes."""
     manager_files = {}
     dependencies = defaultdict(set)
     
-    # First pass: find all manager files
-    for dirpath, _, filenames in os.walk(root_dir):
-        for filename in filenames:
-            if filename.endswith('.swift') and 'Manager' in filename:
-                file_path = os.path.join(dirpath, filename)
-                class_name, deps, imports = extract_class_info(file_path)
-                if class_name:
-                    manager_files[class_name] = file_path
-                    dependencies[class_name] = deps
-    
-    # Also check ViewModels
-    for dirpath, _, filenames in os.walk(root_dir):
-        for filename in filenames:
-            if filename.endswith('ViewModel.swift'):
-                file_path = os.path.join(dirpath, filename)
-                class_name, deps, imports = extract_class_info(file_path)
-                if class_name:
-                    manager_files[class_name] = file_path
-                    dependencies[class_name] = deps
+    # Manager files first, then ViewModels
+    file_paths = manager_paths + viewmodel_paths
+    
+    # Files are independent, so extract them across worker processes
+    if len(file_paths) < MIN_PARALLEL_FILES:
+        class_infos = map(extract_class_info, file_paths)
+    else:
+        chunksize = min(64, max(1, len(file_paths) // (4 * (os.cpu_count() or 1))))
+        with ProcessPoolExecutor() as executor:
+            class_infos = list(executor.map(extract_class_info, file_paths, chunksize=chunksize))
+    
+    for file_path, (class_name, deps, imports) in zip(file_paths, class_infos):
+        if class_name:
+            manager_files[class_name] = file_path
+            dependencies[class_name] = deps
+    
+    # The graph works on small integer ids, in manager_files order; names
+    # are only looked up again for the report
+    names = list(manager_files)
+    id_of = {name: i for i, name in enumerate(names)}
+    
+    # Only follow dependencies we have files for
+    graph = [[id_of[dep] for dep in dependencies[name] if dep in id_of] for name in names]
+    
+    # Every cycle lies within one strongly connected component, so only
+    # components with more than one class (or a self-dependency) have any
+    component_of = [None] * len(names)
+    components = []
+    for component in strongly_connected_components(graph):
+        if len(component) > 1 or component[0] in graph[component[0]]:
+            components.append(sorted(names[i] for i in component))
+            members = set(component)
+            for i in component:
+                component_of[i] = members
     
     # Find circular dependencies
     circular_deps = []
-    checked = set()
     
-    def find_cycles(start, current, path, visited):
-        if current in visited and current == start and len(path) > 1:
-            return [path]
-        if current in visited or len(path) > 10:
-            return []
-        
+    def find_cycles(start):
+        """Return the dependency chains (up to 10 classes) that lead from start back to start."""
+        # A cycle back to start stays in its component, so restrict the
+        # dependencies to it once rather than on every step of the walk
+        allowed = component_of[start]
+        successors = {node: [dep for dep in graph[node] if dep in allowed] for node in allowed}
         cycles = []
-        visited.add(current)
         
-        for dep in dependencies.get(current, []):
-            if dep in manager_files:  # Only follow dependencies we have files for
-                cycles.extend(find_cycles(start, dep, path + [dep], visited.copy()))
+        # Iterative DFS over one shared path; on_path holds the classes on it
+        path = [start]
+        on_path = {start}
+        work = [iter(successors[start])]
+        
+        while work:
+            for dep in work[-1]:
+                if dep == start:
+                    cycles.append(path + [start])
+                elif dep not in on_path and len(path) < 10:
+                    path.append(dep)
+                    on_path.add(dep)
+                    work.append(iter(successors[dep]))
+                    break
+            else:
+                work.pop()
+                on_path.discard(path.pop())
         
         return cycles
     
-    for manager in manager_files:
-        cycles = find_cycles(manager, manager, [manager], set())
+    for manager in range(len(names)):
+        if component_of[manager] is None:
+            continue
+        cycles = find_cycles(manager)
+        
+        # Every cycle through this class has now been found, so later
+        # searches need not walk through it again
+        component_of[manager].discard(manager)
+        
+        # Each cycle is found exactly once, from its smallest id, so cycles
+        # through the same classes in a different order are all reported
         for cycle in cycles:
-            cycle_key = tuple(sorted(set(cycle[:-1])))  # Remove duplicate and sort
-            if cycle_key not in checked:
-                checked.add(cycle_key)
-                circular_deps.append({
-                    'cycle': cycle,
-                    'files': [manager_files.get(m, 'Unknown') for m in cycle[:-1]]
-                })
+            cycle = [names[i] for i in cycle]
+            circular_deps.append({
+                'cycle': cycle,
+                'files': [manager_files.get(m, 'Unknown') for m in cycle[:-1]]
+            })
     
     return {
         'managers': manager_files,
         'dependencies': {k: list(v) for k, v in dependencies.items()},
-        'circular_dependencies': circular_deps
+        'circular_dependencies': circular_deps,
+        'strongly_connected_components': components
     }
 
-def analyze_navigation_patterns(root_dir):
+def analyze_navigation_patterns(view_paths):
     """Analyze navigation-specific patterns that might cause issues."""
     navigation_issues = []
     
     # Look for views that might have circular navigation dependencies
-    for dirpath, _, filenames in os.walk(root_dir):
-        for filename in filenames:
-            if filename.endswith('View.swift'):
-                file_path = os.path.join(dirpath, filename)
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
+    for file_path in view_paths:
+        try:
+            with open(file_path, 'rb') as f, map_file(f) as content:
+                # Check if view references NavigationManager
+                if content.find(b'NavigationManager') != -1:
+                    # Check if it also has navigation destination
+                    if content.find(b'.navigationDestination') != -1 or content.find(b'NavigationLink') != -1:
+                        navigation_issues.append({
+                            'file': file_path,
+                            'issue': 'View uses NavigationManager and has navigation destinations'
+                        })
                         
-                        # Check if view references NavigationManager
-                        if 'NavigationManager' in content:
-                            # Check if it also has navigation destination
-                            if '.navigationDestination' in content or 'NavigationLink' in content:
-                                navigation_issues.append({
-                                    'file': file_path,
-                                    'issue': 'View uses NavigationManager and has navigation destinations'
-                                })
-                                
-                except Exception as e:
-                    print(f"Error analyzing {file_path}: {e}")
+        except Exception as e:
+            print(f"Error analyzing {file_path}: {e}")
     
     return navigation_issues
 
@@ -164,8 +300,11 @@ def main():
     
     print("=== Advanced Circular Dependency Analysis ===\n")
     
+    # One walk finds every file either analysis looks at
+    manager_paths, viewmodel_paths, view_paths = collect_swift_targets(root_dir)
+    
     # Analyze manager dependencies
-    manager_results = find_manager_circular_dependencies(root_dir)
+    manager_results = find_manager_circular_dependencies(manager_paths, viewmodel_paths)
     
     print(f"Found {len(manager_results['managers'])} Manager/ViewModel classes\n")
     
@@ -181,6 +320,13 @@ def main():
     else:
         print("✅ No circular dependencies found among Manager/ViewModel classes\n")
     
+    # Components include cycles of any length, not just the chains listed above
+    if manager_results['strongly_connected_components']:
+        print(f"Found {len(manager_results['strongly_connected_components'])} groups of mutually dependent classes:\n")
+        for i, component in enumerate(manager_results['strongly_connected_components'], 1):
+            print(f"{i}. {', '.join(component)}")
+        print()
+    
     # Show dependency graph for key managers
     print("\n=== Key Manager Dependencies ===\n")
     key_managers = ['NavigationManager', 'FirebaseManager', 'CoreDataManager', 
@@ -196,19 +342,20 @@ def main():
                 print()
     
     # Analyze navigation patterns
-    nav_issues = analyze_navigation_patterns(root_dir)
+    nav_issues = analyze_navigation_patterns(view_paths)
     if nav_issues:
         print(f"\n⚠️  Found {len(nav_issues)} potential navigation issues:")
         for issue in nav_issues[:5]:  # Show first 5
             print(f"  - {issue['file']}")
             print(f"    Issue: {issue['issue']}")
     
-    # Save detailed results
-    with open('/Users/cvr/Documents/Project/MedicationManager/dependency_analysis_detailed.json', 'w') as f:
-        json.dump({
-            'manager_analysis': manager_results,
-            'navigation_issues': nav_issues
-        }, f, indent=2)
+    # Save detailed results, serialized in one go and written once
+    report_json = json.dumps({
+        'manager_analysis': manager_results,
+        'navigation_issues': nav_issues
+    }, indent=2)
+    with open('/Users/cvr/Documents/Project/MedicationManager/dependency_analysis_detailed.json', 'w', buffering=1 << 20) as f:
+        f.write(report_json)
     
     print("\n\nDetailed results saved to dependency_analysis_detailed.json")
 
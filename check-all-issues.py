@@ -1,148 +1,261 @@
 #!/usr/bin/env python3
+import io
 import os
 import re
 import json
 from pathlib import Path
 from collections import defaultdict
+from functools import lru_cache, partial
+from itertools import groupby
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
 
-def analyze_swift_files():
-    root_path = Path("/Users/cvr/Documents/Project/MedicationManager")
+# Below this many files, starting worker processes costs more than it saves
+MIN_PARALLEL_FILES = 64
+
+# Line patterns by issue type: code issues are checked outside comments,
+# style issues on the whole line
+CODE_ISSUE_PATTERNS = {
+    'force_unwrapping': r'[a-zA-Z0-9_\]\)]\s*!\s*[^\s!=]',
+    'force_cast': r'as!\s+\w+',
+    'force_try': r'try!\s+',
+}
+STYLE_ISSUE_PATTERNS = {
+    'color': r'Color\((red:|green:|blue:|"#|\.\w+)',
+    'font': r'\.font\(.system\(size:\s*\d+',
+    'spacing': r'\.(padding|spacing)\(\d+\.?\d*\)',
+}
+ISSUE_PATTERNS = {**CODE_ISSUE_PATTERNS, **STYLE_ISSUE_PATTERNS}
+CODE_ISSUE_TYPES = tuple(CODE_ISSUE_PATTERNS)
+STYLE_ISSUE_TYPES = tuple(STYLE_ISSUE_PATTERNS)
+STYLE_SEVERITY = {'color': 'Medium', 'font': 'Medium', 'spacing': 'Low'}
+
+# Substrings each issue type's pattern needs; most lines have none of them
+ISSUE_LITERALS = {
+    'force_unwrapping': ('!',),
+    'force_cast': ('as!',),
+    'force_try': ('try!',),
+    'color': ('Color(',),
+    'font': ('.font(',),
+    'spacing': ('.padding(', '.spacing('),
+}
+
+STRING_RE = re.compile(r'"([^"]+)"')
+IDENTIFIER_RE = re.compile(r'^[a-zA-Z0-9_\-\.]+$')
+
+# Detail view navigation patterns
+OBJECT_NAVIGATION_RE = re.compile(r'let\s+\w+:\s*(Medication|Doctor|Supplement|MedicationConflict)(?!\w)')
+ID_NAVIGATION_RE = re.compile(r'let\s+\w+Id:\s*String')
+
+# Paths containing any of these are tests, previews or build output
+SKIP_FRAGMENTS = ("Test", "Preview", ".build")
+
+def iter_source_swift(root):
+    """Yield the app's Swift source paths under root, pruning skipped directories as they are reached"""
+    # A fragment cannot span a path separator, so checking the root and each
+    # name on the way down is the same as checking every full path
+    if any(skip in root for skip in SKIP_FRAGMENTS):
+        return
+    
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if any(skip in entry.name for skip in SKIP_FRAGMENTS):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.endswith(".swift") and "MedicationManager" in entry.path:
+                        yield entry.path
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+@lru_cache(maxsize=None)
+def issue_re(issue_types):
+    """Compile the patterns of the given issue types into one regex, a named group each"""
+    return re.compile('|'.join(f'(?P<{issue_type}>{ISSUE_PATTERNS[issue_type]})' for issue_type in issue_types))
+
+def find_issue_types(line, issue_types):
+    """Return the set of issue types whose pattern matches somewhere in line"""
+    # Substring checks rule out types far more cheaply than a failed search
+    candidates = []
+    for issue_type in issue_types:
+        for literal in ISSUE_LITERALS[issue_type]:
+            if literal in line:
+                candidates.append(issue_type)
+                break
+    issue_types = tuple(candidates)
+    
+    found = set()
+    pos = 0
+    
+    # Each search reports the leftmost match of any remaining type; searching
+    # again from that position without its type finds overlapping matches too
+    while issue_types:
+        match = issue_re(issue_types).search(line, pos)
+        if match is None:
+            break
+        found.add(match.lastgroup)
+        issue_types = tuple(t for t in issue_types if t != match.lastgroup)
+        pos = match.start()
+    
+    return found
+
+def analyze_file(root_prefix, file_path):
+    """Check one Swift file, returning its issues by category"""
     issues = defaultdict(list)
     
-    # Get all Swift files
-    swift_files = list(root_path.rglob("*.swift"))
-    
-    for file_path in swift_files:
-        if "MedicationManager" in str(file_path) and not any(skip in str(file_path) for skip in ["Test", "Preview", ".build"]):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    lines = content.split('\n')
-                
-                relative_path = str(file_path.relative_to(root_path))
-                
-                # 1. Force Unwrapping - More precise check
-                for i, line in enumerate(lines, 1):
-                    # Skip comments
-                    if '//' in line:
-                        line = line[:line.index('//')]
-                    
-                    # Check for force unwrap patterns
-                    if re.search(r'[a-zA-Z0-9_\]\)]\s*!\s*[^\s!=]', line):
-                        if not any(exclude in line for exclude in ['!=', '!!', 'try!', 'as!']):
-                            issues["force_unwrapping"].append({
-                                "file": relative_path,
-                                "line": i,
-                                "code": line.strip(),
-                                "severity": "High"
-                            })
-                    
-                    # Check for force cast
-                    if re.search(r'as!\s+\w+', line):
-                        issues["force_cast"].append({
-                            "file": relative_path,
-                            "line": i,
-                            "code": line.strip(),
-                            "severity": "High"
-                        })
-                    
-                    # Check for try!
-                    if re.search(r'try!\s+', line):
-                        issues["force_try"].append({
-                            "file": relative_path,
-                            "line": i,
-                            "code": line.strip(),
-                            "severity": "High"
-                        })
-                
-                # 2. Hardcoded Strings (excluding config files)
-                if not any(config in relative_path for config in ["AppStrings", "Configuration", "AppTheme", "CommonStrings"]):
-                    for i, line in enumerate(lines, 1):
-                        # Skip imports and certain patterns
-                        if line.strip().startswith(('import ', '@', 'case ', '#if', '#else', '#endif')):
-                            continue
-                        
-                        # Find quoted strings
-                        strings = re.findall(r'"([^"]+)"', line)
-                        for string in strings:
-                            # Check if it's a user-facing string
-                            if (len(string) > 3 and 
-                                (' ' in string or string.endswith((':',  '?', '!', '.'))) and
-                                not re.match(r'^[a-zA-Z0-9_\-\.]+$', string) and
-                                not string.startswith(('http', 'com.', '+1'))):
-                                
-                                issues["hardcoded_string"].append({
-                                    "file": relative_path,
-                                    "line": i,
-                                    "string": string,
-                                    "code": line.strip(),
-                                    "severity": "Medium"
-                                })
-                
-                # 3. UIApplication without UIKit import
-                if 'UIApplication' in content and 'import UIKit' not in content:
-                    issues["missing_import"].append({
+    relative_path = file_path[len(root_prefix):]
+    
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        # Which checks apply depends only on the file's path
+        check_strings = not any(config in relative_path for config in ["AppStrings", "Configuration", "AppTheme", "CommonStrings"])
+        check_style = 'AppTheme' not in relative_path
+        
+        # Line checks run in one pass without splitting the file into a list;
+        # each category collects its issues in line order
+        code_issues = defaultdict(list)
+        string_issues = []
+        style_issues = []
+        
+        for i, line in enumerate(io.StringIO(content), 1):
+            # 1. Force Unwrapping - More precise check
+            # Skip comments
+            code = line[:line.index('//')] if '//' in line else line
+            
+            found = find_issue_types(code, CODE_ISSUE_TYPES)
+            
+            # Check for force unwrap patterns
+            if 'force_unwrapping' in found:
+                if not any(exclude in code for exclude in ['!=', '!!', 'try!', 'as!']):
+                    code_issues["force_unwrapping"].append({
                         "file": relative_path,
-                        "line": 0,
-                        "missing": "import UIKit",
+                        "line": i,
+                        "code": code.strip(),
                         "severity": "High"
                     })
-                
-                # 4. Navigation pattern check for DetailViews
-                if 'DetailView' in relative_path:
-                    # Check for object-based navigation
-                    object_match = re.search(r'let\s+\w+:\s*(Medication|Doctor|Supplement|MedicationConflict)(?!\w)', content)
-                    id_match = re.search(r'let\s+\w+Id:\s*String', content)
-                    
-                    if object_match and not id_match:
-                        for i, line in enumerate(lines, 1):
-                            if object_match.group() in line:
-                                issues["navigation_pattern"].append({
-                                    "file": relative_path,
-                                    "line": i,
-                                    "issue": "Detail view uses object-based navigation instead of ID-based",
-                                    "severity": "High"
-                                })
-                                break
-                
-                # 5. Hardcoded colors/fonts/spacing
-                for i, line in enumerate(lines, 1):
-                    # Hardcoded colors
-                    if re.search(r'Color\((red:|green:|blue:|"#|\.\w+)', line) and 'AppTheme' not in relative_path:
-                        issues["hardcoded_style"].append({
-                            "file": relative_path,
-                            "line": i,
-                            "type": "color",
-                            "code": line.strip(),
-                            "severity": "Medium"
-                        })
-                    
-                    # Hardcoded fonts
-                    if re.search(r'\.font\(.system\(size:\s*\d+', line) and 'AppTheme' not in relative_path:
-                        issues["hardcoded_style"].append({
+            
+            # Check for force cast
+            if 'force_cast' in found:
+                code_issues["force_cast"].append({
+                    "file": relative_path,
+                    "line": i,
+                    "code": code.strip(),
+                    "severity": "High"
+                })
+            
+            # Check for try!
+            if 'force_try' in found:
+                code_issues["force_try"].append({
+                    "file": relative_path,
+                    "line": i,
+                    "code": code.strip(),
+                    "severity": "High"
+                })
+            
+            # 2. Hardcoded Strings (excluding config files), skipping imports and certain patterns
+            if check_strings and not line.strip().startswith(('import ', '@', 'case ', '#if', '#else', '#endif')):
+                # Find quoted strings
+                strings = STRING_RE.findall(line)
+                for string in strings:
+                    # Check if it's a user-facing string
+                    if (len(string) > 3 and 
+                        (' ' in string or string.endswith((':',  '?', '!', '.'))) and
+                        not IDENTIFIER_RE.match(string) and
+                        not string.startswith(('http', 'com.', '+1'))):
+                        
+                        string_issues.append({
                             "file": relative_path,
                             "line": i,
-                            "type": "font",
+                            "string": string,
                             "code": line.strip(),
                             "severity": "Medium"
                         })
-                    
-                    # Hardcoded spacing
-                    if re.search(r'\.(padding|spacing)\(\d+\.?\d*\)', line) and 'AppTheme' not in relative_path:
-                        issues["hardcoded_style"].append({
+            
+            # 5. Hardcoded colors/fonts/spacing (outside the theme)
+            if check_style:
+                found = find_issue_types(line, STYLE_ISSUE_TYPES)
+                
+                # Hardcoded colors, fonts and spacing, in that order
+                for style_type in STYLE_ISSUE_TYPES:
+                    if style_type in found:
+                        style_issues.append({
                             "file": relative_path,
                             "line": i,
-                            "type": "spacing",
+                            "type": style_type,
                             "code": line.strip(),
-                            "severity": "Low"
+                            "severity": STYLE_SEVERITY[style_type]
                         })
-                
-            except Exception as e:
-                issues["file_errors"].append({
+        
+        # Categories in the order the checks are listed
+        issues.update(code_issues)
+        if string_issues:
+            issues["hardcoded_string"] = string_issues
+        
+        # 3. UIApplication without UIKit import
+        if 'UIApplication' in content and 'import UIKit' not in content:
+            issues["missing_import"].append({
+                "file": relative_path,
+                "line": 0,
+                "missing": "import UIKit",
+                "severity": "High"
+            })
+        
+        # 4. Navigation pattern check for DetailViews
+        if 'DetailView' in relative_path:
+            # Check for object-based navigation
+            object_match = OBJECT_NAVIGATION_RE.search(content)
+            id_match = ID_NAVIGATION_RE.search(content)
+            
+            # Report the first line containing the declaration (a declaration
+            # spanning lines is on none)
+            if object_match and not id_match and '\n' not in object_match.group():
+                issues["navigation_pattern"].append({
                     "file": relative_path,
-                    "error": str(e),
-                    "severity": "Critical"
+                    "line": content.count('\n', 0, content.find(object_match.group())) + 1,
+                    "issue": "Detail view uses object-based navigation instead of ID-based",
+                    "severity": "High"
                 })
+        
+        if style_issues:
+            issues["hardcoded_style"] = style_issues
+    
+    except Exception as e:
+        issues["file_errors"].append({
+            "file": relative_path,
+            "error": str(e),
+            "severity": "Critical"
+        })
+    
+    return issues
+
+def analyze_swift_files():
+    root_path = "/Users/cvr/Documents/Project/MedicationManager"
+    issues = defaultdict(list)
+    
+    # Get all Swift files
+    swift_files = list(iter_source_swift(root_path))
+    
+    # Files are independent, so check them across worker processes
+    check = partial(analyze_file, os.path.join(root_path, ''))
+    if len(swift_files) < MIN_PARALLEL_FILES:
+        file_issues = map(check, swift_files)
+    else:
+        chunksize = min(64, max(1, len(swift_files) // (4 * (os.cpu_count() or 1))))
+        with ProcessPoolExecutor() as executor:
+            file_issues = list(executor.map(check, swift_files, chunksize=chunksize))
+    
+    # Merge in file order
+    for partial_issues in file_issues:
+        for category, category_issues in partial_issues.items():
+            issues[category].extend(category_issues)
     
     return issues
 
@@ -188,31 +301,28 @@ def generate_markdown_report(issues):
             report.append(f"\n### {category_name}\n")
             report.append(f"**Count**: {len(issues[category_key])}\n\n")
             
-            # Group by file
-            by_file = defaultdict(list)
-            for issue in issues[category_key]:
-                by_file[issue['file']].append(issue)
+            # Group by file; the sort is stable, so each file keeps its issue order
+            by_file = groupby(sorted(issues[category_key], key=itemgetter('file')), key=itemgetter('file'))
             
-            for file_path, file_issues in sorted(by_file.items()):
+            for file_path, file_issues in by_file:
                 report.append(f"#### {file_path}\n")
                 for issue in file_issues:
-                    if 'line' in issue and issue['line'] > 0:
-                        report.append(f"- Line {issue['line']}: ")
-                    else:
-                        report.append("- ")
-                    
                     if 'code' in issue:
-                        report.append(f"`{issue['code']}`")
+                        detail = f"`{issue['code']}`"
                     elif 'string' in issue:
-                        report.append(f'String: "{issue["string"]}"')
+                        detail = f'String: "{issue["string"]}"'
                     elif 'missing' in issue:
-                        report.append(f"Missing: {issue['missing']}")
+                        detail = f"Missing: {issue['missing']}"
                     elif 'issue' in issue:
-                        report.append(issue['issue'])
+                        detail = issue['issue']
                     elif 'error' in issue:
-                        report.append(f"Error: {issue['error']}")
+                        detail = f"Error: {issue['error']}"
+                    else:
+                        detail = ""
                     
-                    report.append(f" [**{issue.get('severity', 'Unknown')}**]\n")
+                    # One line per issue
+                    location = f"Line {issue['line']}: " if 'line' in issue and issue['line'] > 0 else ""
+                    report.append(f"- {location}{detail} [**{issue.get('severity', 'Unknown')}**]\n")
                 report.append("\n")
     
     # Recommendations
@@ -228,9 +338,10 @@ def main():
     print("Analyzing Swift files...")
     issues = analyze_swift_files()
     
-    # Generate reports
-    with open("comprehensive-issues-report.json", "w") as f:
-        json.dump(issues, f, indent=2)
+    # Generate reports, serializing the JSON in one go and writing it once
+    report_json = json.dumps(issues, indent=2)
+    with open("comprehensive-issues-report.json", "w", buffering=1 << 20) as f:
+        f.write(report_json)
     
     markdown_report = generate_markdown_report(issues)
     with open("comprehensive-issues-report.md", "w") as f:
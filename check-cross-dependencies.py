@@ -8,11 +8,142 @@ Analyzes how files work together and checks integration points
 import os
 import re
 import json
+import heapq
 from pathlib import Path
 from collections import defaultdict, deque
+from functools import cached_property, lru_cache
+from itertools import islice
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
 import networkx as nx
 import matplotlib.pyplot as plt
 
+# Dependency patterns, compiled once
+TYPE_USAGE_RE = re.compile(r'(?:let|var|:)\s+(\w+)(?:<|\s|$)')
+# A singleton-style accessor; the type it is called on is the word before it
+ACCESSOR_RE = re.compile(r'\.(shared|manager|default)')
+CONFORMANCE_RE = re.compile(r':\s*([^{]+)\s*{')
+
+# Navigation patterns, the substring each one needs, and the kind of
+# navigation it finds
+NAV_PATTERNS = [
+    (re.compile(r'NavigationLink.*destination:\s*(\w+)'), 'NavigationLink', 'NavigationLink'),
+    (re.compile(r'\.sheet.*content:.*\{.*(\w+View)'), '.sheet', 'Sheet'),
+    (re.compile(r'\.fullScreenCover.*content:.*\{.*(\w+View)'), '.fullScreenCover', 'FullScreenCover'),
+    (re.compile(r'\.navigate\(to:\s*\.(\w+)'), '.navigate(to:', 'Programmatic')
+]
+
+# Declaration patterns
+CLASS_NAME_RE = re.compile(r'(?:class|struct)\s+(\w+)')
+PROTOCOL_DEF_RE = re.compile(r'protocol\s+(\w+)\s*(?::\s*[^{]+)?\s*{([^}]+)}', re.DOTALL)
+FUNC_NAME_RE = re.compile(r'func\s+(\w+)')
+
+# Names following ': ' or ', ', where protocol conformances are listed
+LISTED_NAME_RE = re.compile(r'[:,] (\w+)')
+
+# Types from Swift and SwiftUI that are never project dependencies
+SYSTEM_TYPES = frozenset({
+    'String', 'Int', 'Double', 'Bool', 'Date', 'URL', 'Data',
+    'Array', 'Dictionary', 'Set', 'Optional', 'Result',
+    'View', 'Text', 'Button', 'VStack', 'HStack', 'ZStack',
+    'ObservableObject', 'Published', 'State', 'Binding'
+})
+
+# Directories that are never part of the app sources
+EXCLUDE_DIRS = frozenset({'DerivedData', '.build', 'Pods', '.git'})
+
+# Below this many files, starting worker processes costs more than it saves
+MIN_PARALLEL_FILES = 64
+
+def accessor_calls(content):
+    """Yield (type, accessor) for every call like CoreDataManager.shared.
+
+    Searching for the word in front of the accessor directly retries it from
+    every character of every word; finding the accessor first and walking back
+    over the word gives the same pairs in linear time.
+    """
+    pos = 0
+    while True:
+        match = ACCESSOR_RE.search(content, pos)
+        if match is None:
+            return
+        start = match.start()
+        # A match never starts inside the previous one
+        while start > pos and (content[start - 1].isalnum() or content[start - 1] == '_'):
+            start -= 1
+        if start < match.start():
+            yield content[start:match.start()], match.group(1)
+            pos = match.end()
+        else:
+            pos = match.start() + 1
+
+@lru_cache(maxsize=None)
+def is_project_type(type_name):
+    """Check if type belongs to project"""
+    return type_name not in SYSTEM_TYPES and type_name[0].isupper()
+
+def find_dependencies(content, has_accessor):
+    """Yield the project types a Swift source depends on, as the matches stream in"""
+    # Direct type usage
+    for match in TYPE_USAGE_RE.finditer(content):
+        if is_project_type(match.group(1)):
+            yield match.group(1)
+    
+    # Function calls, recorded as (type, accessor) pairs
+    if has_accessor:
+        for call in accessor_calls(content):
+            if is_project_type(call):
+                yield call
+    
+    # Protocol conformance
+    for match in CONFORMANCE_RE.finditer(content):
+        for protocol in match.group(1).split(','):
+            protocol = protocol.strip()
+            if is_project_type(protocol):
+                yield protocol
+
+def scan_file(file_path):
+    """Read a Swift file and run every per-file pattern scan over it.
+
+    Returns (scan, error): the scan results, or the read error message.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except Exception as e:
+        return None, str(e)
+    
+    singleton = None
+    if 'static let shared' in content or 'static var shared' in content:
+        class_name = CLASS_NAME_RE.search(content)
+        if class_name:
+            singleton = class_name.group(1)
+    
+    # Most files have no singleton accessor, navigation or protocol
+    # definition; a substring check skips those patterns' scans
+    has_accessor = '.shared' in content or '.manager' in content or '.default' in content
+    
+    # Files repeat the same types many times; each is kept once. A name
+    # that cannot be checked ends the file's dependency scan.
+    dependencies = {}
+    dependency_error = None
+    try:
+        for dep in find_dependencies(content, has_accessor):
+            dependencies[dep] = None
+    except Exception as e:
+        dependency_error = str(e)
+    
+    return {
+        'dependencies': list(dependencies),
+        'dependency_error': dependency_error,
+        'navigation': [(match.group(1), nav_type) for pattern, literal, nav_type in NAV_PATTERNS
+                       if literal in content for match in pattern.finditer(content)],
+        'singleton': singleton,
+        'protocol_defs': [(match.group(1), FUNC_NAME_RE.findall(match.group(2)))
+                          for match in PROTOCOL_DEF_RE.finditer(content)] if 'protocol' in content else [],
+        'listed_names': set(LISTED_NAME_RE.findall(content)),
+    }, None
+
 class CrossDependencyChecker:
     def __init__(self, project_root):
         self.project_root = Path(project_root)
@@ -22,6 +153,8 @@ class CrossDependencyChecker:
         self.navigation_flows = []
         self.data_flows = []
         self.integration_issues = []
+        # (path, scan) of every Swift file read, shared by all analyses
+        self.scans = []
         
     def analyze(self):
         """Main analysis entry point"""
@@ -45,50 +178,30 @@ class CrossDependencyChecker:
         
     def build_dependency_graph(self):
         """Build a graph of file dependencies"""
-        swift_files = self.collect_swift_files()
-        
-        for file_path in swift_files:
+        swift_files = self.swift_files
+        
+        # Files are scanned independently across worker processes; the
+        # graph is then built here, in file order
+        if len(swift_files) < MIN_PARALLEL_FILES:
+            results = map(scan_file, swift_files)
+        else:
+            chunksize = min(64, max(1, len(swift_files) // (4 * (os.cpu_count() or 1))))
+            with ProcessPoolExecutor() as executor:
+                results = list(executor.map(scan_file, swift_files, chunksize=chunksize))
+        
+        for file_path, (scan, error) in zip(swift_files, results):
             file_name = file_path.stem
             self.dependency_graph.add_node(file_name, path=str(file_path))
             
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Find dependencies through various patterns
-                
-                # Direct type usage
-                types_used = re.findall(r'(?:let|var|:)\s+(\w+)(?:<|\s|$)', content)
-                for type_name in types_used:
-                    if self.is_project_type(type_name):
-                        self.dependency_graph.add_edge(file_name, type_name)
-                
-                # Function calls
-                func_calls = re.findall(r'(\w+)\.(shared|manager|default)', content)
-                for manager in func_calls:
-                    if self.is_project_type(manager):
-                        self.dependency_graph.add_edge(file_name, manager)
-                
-                # Protocol conformance
-                conformances = re.findall(r':\s*([^{]+)\s*{', content)
-                for conformance_list in conformances:
-                    protocols = [p.strip() for p in conformance_list.split(',')]
-                    for protocol in protocols:
-                        if self.is_project_type(protocol):
-                            self.dependency_graph.add_edge(file_name, protocol)
-                            
-            except Exception as e:
-                print(f"Error analyzing {file_path}: {e}")
-    
-    def is_project_type(self, type_name):
-        """Check if type belongs to project"""
-        system_types = {
-            'String', 'Int', 'Double', 'Bool', 'Date', 'URL', 'Data',
-            'Array', 'Dictionary', 'Set', 'Optional', 'Result',
-            'View', 'Text', 'Button', 'VStack', 'HStack', 'ZStack',
-            'ObservableObject', 'Published', 'State', 'Binding'
-        }
-        return type_name not in system_types and type_name[0].isupper()
+            if error is not None:
+                print(f"Error analyzing {file_path}: {error}")
+                continue
+            self.scans.append((file_path, scan))
+            
+            # Dependencies found before any error are still added, in one call
+            if scan['dependency_error'] is not None:
+                print(f"Error analyzing {file_path}: {scan['dependency_error']}")
+            self.dependency_graph.add_edges_from((file_name, dep) for dep in scan['dependencies'])
     
     def analyze_api_integration(self):
         """Analyze API integration points"""
@@ -136,31 +249,15 @@ class CrossDependencyChecker:
         """Analyze navigation patterns"""
         print("\n🧭 Analyzing Navigation Flow...")
         
-        nav_patterns = [
-            (r'NavigationLink.*destination:\s*(\w+)', 'NavigationLink'),
-            (r'\.sheet.*content:.*\{.*(\w+View)', 'Sheet'),
-            (r'\.fullScreenCover.*content:.*\{.*(\w+View)', 'FullScreenCover'),
-            (r'\.navigate\(to:\s*\.(\w+)', 'Programmatic')
-        ]
-        
-        for file_path in self.collect_swift_files():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                source = file_path.stem
-                
-                for pattern, nav_type in nav_patterns:
-                    destinations = re.findall(pattern, content)
-                    for dest in destinations:
-                        self.navigation_flows.append({
-                            'source': source,
-                            'destination': dest,
-                            'type': nav_type
-                        })
-                        
-            except:
-                pass
+        for file_path, scan in self.scans:
+            source = file_path.stem
+            
+            for dest, nav_type in scan['navigation']:
+                self.navigation_flows.append({
+                    'source': source,
+                    'destination': dest,
+                    'type': nav_type
+                })
         
         print(f"  Found {len(self.navigation_flows)} navigation connections")
     
@@ -170,47 +267,91 @@ class CrossDependencyChecker:
         
         # Track data flow from models to views
         models = [node for node in self.dependency_graph.nodes() if 'Model' in node and 'ViewModel' not in node]
+        views = [node for node in self.dependency_graph.nodes() if 'View' in node and 'Model' not in node]
+        view_set = set(views)
+        
+        # How far every node is from the nearest view, found once for all
+        # models; searches skip nodes that cannot reach one in time
+        view_distance = self.distances_to(view_set, cutoff=4)
         
         for model in models:
-            # Find path to views
-            paths_to_views = []
-            views = [node for node in self.dependency_graph.nodes() if 'View' in node and 'Model' not in node]
+            if model not in view_distance:
+                continue
             
-            for view in views:
-                try:
-                    paths = list(nx.all_simple_paths(self.dependency_graph, model, view, cutoff=4))
-                    if paths:
-                        paths_to_views.extend(paths)
-                except:
-                    pass
+            # Find paths to views, enumerating the paths from the model once
+            path_counts, first_paths = self.count_simple_paths(model, view_set, 4, view_distance)
             
-            if paths_to_views:
+            if path_counts:
                 self.data_flows.append({
                     'model': model,
-                    'view_paths': len(paths_to_views),
-                    'sample_path': paths_to_views[0] if paths_to_views else []
+                    'view_paths': sum(path_counts.values()),
+                    'sample_path': next(first_paths[view] for view in views if view in first_paths)
                 })
         
         print(f"  Analyzed {len(self.data_flows)} model-to-view data flows")
     
+    def distances_to(self, targets, cutoff):
+        """Map each node within cutoff edges of a target to its distance to the nearest one"""
+        distance = dict.fromkeys(targets, 0)
+        frontier = list(targets)
+        
+        # Breadth-first search backwards from all targets at once
+        for depth in range(1, cutoff + 1):
+            next_frontier = []
+            for node in frontier:
+                for predecessor in self.dependency_graph.predecessors(node):
+                    if predecessor not in distance:
+                        distance[predecessor] = depth
+                        next_frontier.append(predecessor)
+            frontier = next_frontier
+        
+        return distance
+    
+    def count_simple_paths(self, source, targets, cutoff, distance):
+        """Count the simple paths of up to cutoff edges from source to each target.
+
+        distance is distances_to(targets, cutoff); paths are not extended
+        through nodes too far from every target to reach one in time.
+        Returns the path count and the first path found (in successor order,
+        as nx.all_simple_paths yields them) for every target reached.
+        """
+        path_counts = defaultdict(int)
+        first_paths = {}
+        
+        # Iterative DFS over one shared path; on_path holds the nodes on it
+        path = [source]
+        on_path = {source}
+        work = [iter(self.dependency_graph.successors(source))]
+        
+        while work:
+            for node in work[-1]:
+                if node in on_path:
+                    continue
+                if node in targets:
+                    path_counts[node] += 1
+                    if node not in first_paths:
+                        first_paths[node] = path + [node]
+                # Targets can lie on the way to other targets, so keep going
+                if len(path) < cutoff and distance.get(node, cutoff) <= cutoff - len(path):
+                    path.append(node)
+                    on_path.add(node)
+                    work.append(iter(self.dependency_graph.successors(node)))
+                    break
+            else:
+                work.pop()
+                on_path.discard(path.pop())
+        
+        return path_counts, first_paths
+    
     def check_singleton_usage(self):
         """Check singleton pattern usage"""
         print("\n🔐 Checking Singleton Usage...")
         
         singletons = []
-        for file_path in self.collect_swift_files():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Find singleton patterns
-                if 'static let shared' in content or 'static var shared' in content:
-                    class_name = re.search(r'(?:class|struct)\s+(\w+)', content)
-                    if class_name:
-                        singletons.append(class_name.group(1))
-                        
-            except:
-                pass
+        # Singleton classes were found by the file scans
+        for file_path, scan in self.scans:
+            if scan['singleton']:
+                singletons.append(scan['singleton'])
         
         print(f"  Found {len(singletons)} singletons: {', '.join(singletons)}")
         
@@ -231,24 +372,17 @@ class CrossDependencyChecker:
         protocols = {}
         implementations = defaultdict(list)
         
-        for file_path in self.collect_swift_files():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Find protocol definitions
-                protocol_defs = re.findall(r'protocol\s+(\w+)\s*(?::\s*[^{]+)?\s*{([^}]+)}', content, re.DOTALL)
-                for name, body in protocol_defs:
-                    required_methods = re.findall(r'func\s+(\w+)', body)
-                    protocols[name] = required_methods
-                
-                # Find implementations
-                for prot_name in protocols:
-                    if f': {prot_name}' in content or f', {prot_name}' in content:
-                        implementations[prot_name].append(file_path.stem)
-                        
-            except:
-                pass
+        for file_path, scan in self.scans:
+            # Protocol definitions were found by the file scans
+            for name, required_methods in scan['protocol_defs']:
+                protocols[name] = required_methods
+            
+            # Find implementations: a protocol is implemented where ': Name'
+            # or ', Name' appears, i.e. where a listed name starts with it
+            listed_prefixes = {name[:end] for name in scan['listed_names'] for end in range(1, len(name) + 1)}
+            for prot_name in protocols:
+                if prot_name in listed_prefixes:
+                    implementations[prot_name].append(file_path.stem)
         
         # Check for protocols without implementations
         for protocol, implementers in implementations.items():
@@ -259,17 +393,30 @@ class CrossDependencyChecker:
                 })
             print(f"  {protocol}: {len(implementers)} implementations")
     
+    @cached_property
+    def swift_files(self):
+        """All Swift files, collected once"""
+        return self.collect_swift_files()
+    
     def collect_swift_files(self):
         """Collect all Swift files"""
         swift_files = []
-        exclude_dirs = {'DerivedData', '.build', 'Pods', '.git'}
+        stack = [os.path.join(self.project_root, 'MedicationManager')]
         
-        for root, dirs, files in os.walk(self.project_root / 'MedicationManager'):
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
-            
-            for file in files:
-                if file.endswith('.swift'):
-                    swift_files.append(Path(root) / file)
+        # Walk with scandir, whose entries know their type without a stat;
+        # like os.walk, symlinked directories are not followed
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            if entry.name not in EXCLUDE_DIRS and not entry.is_symlink():
+                                stack.append(entry.path)
+                        elif entry.name.endswith('.swift'):
+                            swift_files.append(Path(entry.path))
+            except OSError:
+                continue
                     
         return sorted(swift_files)
     
@@ -287,24 +434,24 @@ class CrossDependencyChecker:
         
         # Most dependent files
         print(f"\n🎯 Most Depended Upon (Top 5):")
-        in_degrees = dict(self.dependency_graph.in_degree())
-        top_deps = sorted(in_degrees.items(), key=lambda x: x[1], reverse=True)[:5]
+        top_deps = heapq.nlargest(5, self.dependency_graph.in_degree(), key=itemgetter(1))
         for file, count in top_deps:
             print(f"  {file}: {count} dependents")
         
         # Most dependent files
         print(f"\n🔗 Most Dependencies (Top 5):")
-        out_degrees = dict(self.dependency_graph.out_degree())
-        top_users = sorted(out_degrees.items(), key=lambda x: x[1], reverse=True)[:5]
+        top_users = heapq.nlargest(5, self.dependency_graph.out_degree(), key=itemgetter(1))
         for file, count in top_users:
             print(f"  {file}: {count} dependencies")
         
         # Circular dependencies
         print(f"\n🔄 Circular Dependencies:")
         try:
-            cycles = list(nx.simple_cycles(self.dependency_graph))
+            # Only the first few are shown, so stop enumerating there; a
+            # dense graph can have exponentially many cycles
+            cycles = list(islice(nx.simple_cycles(self.dependency_graph), 5))
             if cycles:
-                for cycle in cycles[:5]:
+                for cycle in cycles:
                     print(f"  {' -> '.join(cycle)} -> {cycle[0]}")
             else:
                 print("  ✅ No circular dependencies found")
@@ -328,18 +475,20 @@ class CrossDependencyChecker:
             'integration_issues': self.integration_issues
         }
         
-        with open('cross-dependency-report.json', 'w') as f:
-            json.dump(report, f, indent=2)
+        # Serialized in one go and written once
+        report_json = json.dumps(report, indent=2)
+        with open('cross-dependency-report.json', 'w', buffering=1 << 20) as f:
+            f.write(report_json)
         
         print("\n💾 Detailed report saved to cross-dependency-report.json")
     
     def visualize_dependencies(self):
         """Create dependency visualization"""
         try:
-            plt.figure(figsize=(20, 16))
+            fig = plt.figure(figsize=(20, 16))
             
-            # Create layout
-            pos = nx.spring_layout(self.dependency_graph, k=3, iterations=50)
+            # Create layout; a fixed seed gives the same picture on every run
+            pos = nx.spring_layout(self.dependency_graph, k=3, iterations=50, seed=0)
             
             # Color nodes by type
             node_colors = []
@@ -369,7 +518,10 @@ class CrossDependencyChecker:
             plt.title("MedicationManager Dependency Graph", fontsize=16)
             plt.axis('off')
             plt.tight_layout()
-            plt.savefig('dependency-graph.png', dpi=150, bbox_inches='tight')
+            # Save through the figure: pyplot's savefig renders it once more
+            # afterwards to refresh the canvas
+            fig.savefig('dependency-graph.png', dpi=150, bbox_inches='tight')
+            plt.close(fig)
             print("\n📊 Dependency graph saved to dependency-graph.png")
             
         except Exception as e:
@@ -6,35 +6,84 @@ Check for force unwrapping issues in Swift files
 import os
 import re
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+# Below this many files, starting worker processes costs more than it saves
+MIN_PARALLEL_FILES = 64
+
+# Comments, and the string literals they must not be found in
+COMMENT_RE = re.compile(r'//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"', re.DOTALL)
+NON_NEWLINE_RE = re.compile(r'[^\n]')
+
+# Lines containing a '!', which every issue type needs
+BANG_LINE_RE = re.compile(r'^[^\n!]*![^\n]*\n?', re.MULTILINE)
+
+# Line patterns, compiled once
+BANG_RE = re.compile(r'(?<![!=])!(?![=!])')
+IMPLICIT_UNWRAP_RE = re.compile(r':\s*\w+!')
+# A '!' ending the code may be followed by spaces or a blanked-out comment
+FORCE_UNWRAP_RE = re.compile(r'\w+![\.\[\(]|!\s*$')
+
+# Lines already fixed, by file name
+FIXED_LINES = {
+    "DoctorListViewModel.swift": frozenset({344, 345}),
+    "MedicationCard.swift": frozenset({271}),
+    "SyncTestRunner.swift": frozenset({212})
+}
+
+# Files whose status is always reported
+CRITICAL_FILES = (
+    "CoreDataManager.swift",
+    "FirebaseManager.swift",
+    "PhoneAuthView.swift"
+)
+
+def blank_comment(match):
+    """Replace a comment with spaces (keeping its newlines); leave string literals as they are"""
+    source = match.group()
+    if source.startswith('"'):
+        return source
+    return NON_NEWLINE_RE.sub(' ', source)
 
 def find_force_unwraps(file_path):
     """Find force unwrap patterns in a Swift file"""
     issues = []
     
     with open(file_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-        
-    for line_num, line in enumerate(lines, 1):
-        # Skip comments
-        if line.strip().startswith('//') or line.strip().startswith('///'):
-            continue
+        text = f.read()
+    if '!' not in text:
+        return issues
+    
+    # Blank out comments once up front; positions are unchanged, so the
+    # code's lines line up with the file's
+    code = COMMENT_RE.sub(blank_comment, text)
+    
+    # One pass over the code picks out the lines that can have issues;
+    # line numbers are kept by counting the newlines skipped over
+    line_num = 1
+    pos = 0
+    for match in BANG_LINE_RE.finditer(code):
+        line_num += code.count('\n', pos, match.start())
+        pos = match.start()
+        line = match.group()
+        content = text[match.start():match.end()].strip()
             
         # Check for force unwrap patterns
         # Look for ! that's not part of != or !!
-        if re.search(r'(?<![!=])!(?![=!])', line):
+        if BANG_RE.search(line):
             # Check if it's an implicitly unwrapped optional declaration
-            if re.search(r':\s*\w+!', line):
+            if IMPLICIT_UNWRAP_RE.search(line):
                 issues.append({
                     'line': line_num,
                     'type': 'implicitly_unwrapped_optional',
-                    'content': line.strip()
+                    'content': content
                 })
             # Check for force unwrap usage
-            elif re.search(r'\w+![\.\[\(]|!$', line):
+            elif FORCE_UNWRAP_RE.search(line):
                 issues.append({
                     'line': line_num,
                     'type': 'force_unwrap',
-                    'content': line.strip()
+                    'content': content
                 })
         
         # Check for force cast (as!)
@@ -42,7 +91,7 @@ def find_force_unwraps(file_path):
             issues.append({
                 'line': line_num,
                 'type': 'force_cast',
-                'content': line.strip()
+                'content': content
             })
             
         # Check for force try (try!)
@@ -50,26 +99,50 @@ def find_force_unwraps(file_path):
             issues.append({
                 'line': line_num,
                 'type': 'force_try',
-                'content': line.strip()
+                'content': content
             })
     
     return issues
 
+def walk_swift(root_dir, skip=('.build', 'DerivedData', '.git', 'Pods')):
+    """Yield Swift file paths in os.walk order, without entering skipped directories"""
+    # A directory whose path contains a skipped name is left out along with
+    # everything below it, so it is not walked at all
+    if any(fragment in root_dir for fragment in skip):
+        return
+    
+    stack = [root_dir]
+    while stack:
+        directory = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if not entry.is_symlink() and not any(fragment in entry.name for fragment in skip):
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith('.swift'):
+                        yield entry.path
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
 def scan_project(root_dir):
     """Scan all Swift files in the project"""
     all_issues = {}
+    file_paths = list(walk_swift(root_dir))
     
-    for root, dirs, files in os.walk(root_dir):
-        # Skip certain directories
-        if any(skip in root for skip in ['.build', 'DerivedData', '.git', 'Pods']):
-            continue
-            
-        for file in files:
-            if file.endswith('.swift'):
-                file_path = os.path.join(root, file)
-                issues = find_force_unwraps(file_path)
-                if issues:
-                    all_issues[file_path] = issues
+    # Files are independent, so scan them across worker processes
+    if len(file_paths) < MIN_PARALLEL_FILES:
+        results = map(find_force_unwraps, file_paths)
+    else:
+        chunksize = min(64, max(1, len(file_paths) // (4 * (os.cpu_count() or 1))))
+        with ProcessPoolExecutor() as executor:
+            results = list(executor.map(find_force_unwraps, file_paths, chunksize=chunksize))
+    
+    for file_path, issues in zip(file_paths, results):
+        if issues:
+            all_issues[file_path] = issues
     
     return all_issues
 
@@ -90,24 +163,14 @@ def main():
     print("FORCE UNWRAPPING ISSUES REPORT")
     print("="*80)
     
-    # Files we already fixed
-    fixed_files = {
-        "DoctorListViewModel.swift": [344, 345],
-        "MedicationCard.swift": [271],
-        "SyncTestRunner.swift": [212]
-    }
-    
     for file_path, file_issues in sorted(issues.items()):
-        file_name = os.path.basename(file_path)
+        fixed_lines = FIXED_LINES.get(os.path.basename(file_path), ())
         print(f"\n{file_path}")
         print("-" * len(file_path))
         
         for issue in file_issues:
             # Check if this issue was already fixed
-            is_fixed = False
-            if file_name in fixed_files:
-                if issue['line'] in fixed_files[file_name]:
-                    is_fixed = True
+            is_fixed = issue['line'] in fixed_lines
             
             status = " [FIXED]" if is_fixed else ""
             print(f"  Line {issue['line']}: {issue['type']}{status}")
@@ -137,13 +200,7 @@ def main():
     print("CRITICAL FILES STATUS")
     print("="*80)
     
-    critical_files = [
-        "CoreDataManager.swift",
-        "FirebaseManager.swift",
-        "PhoneAuthView.swift"
-    ]
-    
-    for critical in critical_files:
+    for critical in CRITICAL_FILES:
         found = False
         for file_path in issues.keys():
             if critical in file_path:
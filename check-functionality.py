@@ -9,9 +9,289 @@ import os
 import re
 import json
 import ast
+import heapq
+import hashlib
+import sqlite3
+import subprocess
+import time
 from pathlib import Path
 from collections import defaultdict
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Per-file scan results are cached across runs, keyed by file content
+CACHE_FILE = '.functionality_check_cache.db'
+
+# A file modified this recently (in ns) may change again without its size or
+# mtime moving, so its stat is not trusted to stand for its content
+RACY_MTIME_NS = 2_000_000_000
+
+# Below this many files to scan, starting worker processes costs more than it saves
+MIN_PARALLEL_FILES = 64
+
+# Files per swiftc run; one compiler start-up per batch rather than per file
+SWIFTC_BATCH = 50
+
+# First line of a compiler diagnostic, with the file it is about if it has a location
+DIAGNOSTIC_RE = re.compile(r'^(?:(\S.*?):(?:\d+:){1,2} )?(error|warning|note|remark): ')
+
+# Declarations of each kind, compiled once. Only the keyword is consumed, so
+# declarations overlapping an earlier match are found too (see non_overlapping)
+DECLARATION_RES = {
+    keyword: re.compile(keyword + r'(?=\s+(\w+))')
+    for keyword in ('protocol', 'class', 'struct', 'enum', 'func')
+}
+TYPE_KEYWORDS = ('protocol', 'class', 'struct', 'enum')
+
+# Other per-file patterns, compiled once
+IMPORT_RE = re.compile(r'^import\s+(\S+)', re.MULTILINE)
+CONFORMANCE_RE = re.compile(r':\s*([^{]+)\s*{')
+
+# Comments and string literals (multi-line ones first), which hold no code.
+# Only block comments and multi-line strings span lines
+NON_CODE_RE = re.compile(r'"""(?:\\.|[^\\])*?"""|"(?:\\[^\n]|[^"\\\n])*"|//[^\n]*|/\*.*?\*/', re.DOTALL)
+# A '!' that is not part of '!=' or '!!'
+FORCE_UNWRAP_RE = re.compile(r'(?<![!=])!(?![=!])')
+
+def script_digest():
+    """Hash this script so cached scans are dropped when it changes"""
+    with open(os.path.abspath(__file__), 'rb') as f:
+        return hashlib.sha256(f.read()).digest()
+
+def open_cache(path):
+    """Open the per-file scan cache, emptying it if this script changed since it was written"""
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE IF NOT EXISTS script(digest BLOB)')
+    digest = script_digest()
+    if conn.execute('SELECT digest FROM script').fetchone() != (digest,):
+        with conn:
+            conn.execute('DROP TABLE IF EXISTS scan')
+            conn.execute('DROP TABLE IF EXISTS syntax')
+            conn.execute('DELETE FROM script')
+            conn.execute('INSERT INTO script VALUES (?)', (digest,))
+    conn.execute('CREATE TABLE IF NOT EXISTS scan(path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha BLOB, data TEXT)')
+    conn.execute('CREATE TABLE IF NOT EXISTS syntax(path TEXT PRIMARY KEY, sha BLOB, error TEXT)')
+    return conn
+
+def non_overlapping(matches):
+    """Names of the (start, end, name) matches a left-to-right regex scan would report"""
+    names = []
+    end = 0
+    for start, stop, name in matches:
+        if start >= end:
+            names.append(name)
+            end = stop
+    return names
+
+def count_force_unwraps(content):
+    """Count the '!'s in code, leaving out comments, string literals, '!=' and '!!'"""
+    if '!' not in content:
+        return 0
+    if '/*' in content or '"""' in content:
+        return len(FORCE_UNWRAP_RE.findall(NON_CODE_RE.sub(' ', content)))
+    
+    # Nothing hiding code spans lines, so only the lines with a '!' need
+    # blanking; they are found by jumping from one '!' to the next
+    count = 0
+    pos = content.find('!')
+    while pos != -1:
+        line_start = content.rfind('\n', 0, pos) + 1
+        line_end = content.find('\n', pos)
+        if line_end == -1:
+            line_end = len(content)
+        count += len(FORCE_UNWRAP_RE.findall(NON_CODE_RE.sub(' ', content[line_start:line_end])))
+        pos = content.find('!', line_end)
+    return count
+
+def used_outside_imports(content, name):
+    """Whether name occurs in content outside the lines starting with 'import'"""
+    # An imported name has no whitespace, so each occurrence lies within one
+    # line; occurrences on import lines are skipped without building a copy
+    # of the content with those lines removed
+    pos = content.find(name)
+    while pos != -1:
+        line_start = content.rfind('\n', 0, pos) + 1
+        if not content.startswith('import', line_start):
+            return True
+        line_end = content.find('\n', pos)
+        if line_end == -1:
+            return False
+        pos = content.find(name, line_end)
+    return False
+
+def scan_source(content):
+    """Run every per-file check that depends only on one file's content"""
+    imports = IMPORT_RE.findall(content)
+    
+    # One scan per declaration keyword serves both the definitions and the
+    # naming check; the type names are what a single class/struct/enum/protocol
+    # pattern would find, i.e. the merged declarations without the overlaps
+    declarations = {
+        keyword: [(match.start(), match.end(1), match.group(1)) for match in pattern.finditer(content)]
+        for keyword, pattern in DECLARATION_RES.items()
+    }
+    
+    # Balanced braces, parentheses and brackets
+    balance_issues = []
+    if content.count('{') != content.count('}'):
+        balance_issues.append("Unbalanced braces")
+    if content.count('(') != content.count(')'):
+        balance_issues.append("Unbalanced parentheses")
+    if content.count('[') != content.count(']'):
+        balance_issues.append("Unbalanced brackets")
+    
+    # Imports not used outside the import statements (basic heuristic)
+    unused_imports = [
+        imp for imp in imports
+        if imp not in ['Foundation', 'SwiftUI', 'Combine']  # Always needed
+        and not used_outside_imports(content, imp)
+    ]
+    
+    # Markers that several checks (or every conformance) look for, searched for once
+    has_body = 'body' in content
+    has_published = '@Published' in content
+    has_main_actor = '@MainActor' in content
+    has_async = 'async' in content
+    
+    # Protocol conformances missing their usual members; the markers are plain
+    # substrings, so the listed protocols need no stripping
+    conformance_issues = []
+    for conformance in CONFORMANCE_RE.findall(content):
+        for protocol in conformance.split(','):
+            if 'View' in protocol and not has_body:
+                conformance_issues.append('View protocol requires body property')
+            
+            if 'ObservableObject' in protocol and not has_published:
+                conformance_issues.append('ObservableObject typically needs @Published properties')
+    
+    return {
+        'imports': imports,
+        'needs_swiftui': 'View {' in content and 'import SwiftUI' not in content,
+        'needs_observation': ('Observable' in content and 'import Observation' not in content
+                              and '@Observable' in content),
+        'protocols': non_overlapping(declarations['protocol']),
+        'classes': non_overlapping(declarations['class']),
+        'structs': non_overlapping(declarations['struct']),
+        'enums': non_overlapping(declarations['enum']),
+        'balance_issues': balance_issues,
+        'unused_imports': unused_imports,
+        'conformance_issues': conformance_issues,
+        'force_unwraps': count_force_unwraps(content),
+        'unawaited_async': has_async and 'Task {' not in content and 'await' not in content,
+        'main_actor': has_main_actor,
+        'ui_code': 'NavigationLink' in content or 'Button {' in content,
+        'data_access': 'URLSession' in content or 'CoreDataManager' in content,
+        'type_names': non_overlapping(heapq.merge(*(declarations[keyword] for keyword in TYPE_KEYWORDS))),
+        'func_names': non_overlapping(declarations['func']),
+        'completion_handlers': 'completion:' in content and not has_async,
+        'published_off_main_actor': has_published and not has_main_actor,
+    }
+
+def swiftc_version():
+    """The installed swiftc's version output, or None if it cannot be run"""
+    try:
+        result = subprocess.run(['swiftc', '--version'], capture_output=True, text=True)
+    except Exception:
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+def run_swiftc(paths):
+    """Run swiftc -parse over the given files, returning its exit code and stderr"""
+    result = subprocess.run(
+        ['swiftc', '-parse', *paths],
+        capture_output=True,
+        text=True
+    )
+    return result.returncode, result.stderr
+
+def split_diagnostics(stderr, paths):
+    """Split batched swiftc output into each failing file's diagnostics; None if some names no file"""
+    sections = defaultdict(list)
+    failed = set()
+    current = None
+    
+    for line in stderr.splitlines(keepends=True):
+        match = DIAGNOSTIC_RE.match(line)
+        if match:
+            current = match.group(1)
+            if current not in paths:
+                return None
+            if match.group(2) == 'error':
+                failed.add(current)
+        elif current is None:
+            return None
+        sections[current].append(line)
+    
+    return {path: ''.join(sections[path]) for path in failed}
+
+def swiftc_errors(paths):
+    """Parse a batch of files with swiftc, returning the diagnostics of each file that fails"""
+    returncode, stderr = run_swiftc(paths)
+    if returncode == 0:
+        return {}
+    
+    errors = split_diagnostics(stderr, set(paths))
+    if not errors:
+        # Output that cannot be split up by file: parse the files one by one
+        errors = {}
+        for path in paths:
+            returncode, stderr = run_swiftc([path])
+            if returncode != 0:
+                errors[path] = stderr
+    
+    return errors
+
+def find_cycles(graph):
+    """Strongly connected components of graph that contain a cycle, each as sorted members"""
+    # Tarjan's algorithm with an explicit stack of (node, remaining neighbors)
+    # frames instead of recursion, so deep graphs cannot hit the recursion limit
+    index = {}
+    lowlink = {}
+    component_stack = []
+    on_stack = set()
+    cycles = []
+    
+    for root in graph:
+        if root in index:
+            continue
+        
+        index[root] = lowlink[root] = len(index)
+        component_stack.append(root)
+        on_stack.add(root)
+        frames = [(root, iter(sorted(graph.get(root, ()))))]
+        
+        while frames:
+            node, neighbors = frames[-1]
+            for neighbor in neighbors:
+                if neighbor not in index:
+                    index[neighbor] = lowlink[neighbor] = len(index)
+                    component_stack.append(neighbor)
+                    on_stack.add(neighbor)
+                    frames.append((neighbor, iter(sorted(graph.get(neighbor, ())))))
+                    break
+                if neighbor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[neighbor])
+            else:
+                # All neighbors done: pass the lowlink up and pop a finished component
+                frames.pop()
+                if frames:
+                    parent = frames[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                
+                if lowlink[node] == index[node]:
+                    members = []
+                    while True:
+                        member = component_stack.pop()
+                        on_stack.discard(member)
+                        members.append(member)
+                        if member == node:
+                            break
+                    
+                    # A single node is only a cycle if it depends on itself
+                    if len(members) > 1 or node in graph.get(node, ()):
+                        cycles.append(sorted(members))
+    
+    return cycles
 
 class FunctionalityChecker:
     def __init__(self, project_root):
@@ -38,6 +318,16 @@ class FunctionalityChecker:
         self.structs = {}
         self.enums = {}
         self.functions = {}
+        # Each file's path relative to the project root, as issues report it
+        self.rel_paths = {}
+        # swiftc diagnostics of failing files, and files swiftc could not be run on
+        self.swiftc_diagnostics = {}
+        self.unparsed_files = set()
+        # Per-file scan results by file path, the errors of files that could not
+        # be read, and the cache keys of files that could
+        self.scans = {}
+        self.scan_errors = {}
+        self.file_shas = {}
         
     def check_all(self):
         """Main entry point for all checks"""
@@ -50,6 +340,8 @@ class FunctionalityChecker:
         
         # Phase 1: Syntax and basic checks
         print("Phase 1: Syntax and Import Analysis...")
+        self.scan_files(swift_files)
+        self.parse_files(swift_files)
         for file_path in swift_files:
             self.check_syntax(file_path)
             self.analyze_imports(file_path)
@@ -80,63 +372,170 @@ class FunctionalityChecker:
         swift_files = []
         exclude_dirs = {'DerivedData', '.build', 'Pods', '.git', 'build'}
         
-        for root, dirs, files in os.walk(self.project_root / 'MedicationManager'):
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
+        # scandir reports each entry's type without a stat per entry; paths stay
+        # strings until they are sorted
+        stack = [str(self.project_root / 'MedicationManager')]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            # Symlinked directories are not followed, as with os.walk
+                            if entry.name not in exclude_dirs and not entry.is_symlink():
+                                stack.append(entry.path)
+                        elif entry.name.endswith('.swift'):
+                            swift_files.append(entry.path)
+            except OSError:
+                continue
+        
+        # Sorted component-wise, the same order as sorting the Paths
+        swift_files = [Path(path) for path in sorted(swift_files, key=lambda path: path.split(os.sep))]
+        self.rel_paths = {
+            str(file_path): str(file_path.relative_to(self.project_root))
+            for file_path in swift_files
+        }
+        return swift_files
+    
+    def parse_files(self, swift_files):
+        """Check Swift syntax of all files using swiftc, in batches across threads"""
+        # Results are cached by file content and compiler version, so files
+        # parsed by the same swiftc before are not parsed again
+        cache = open_cache(self.project_root / CACHE_FILE)
+        version = swiftc_version()
+        cached = {}
+        if version is not None:
+            cached = {row[0]: row[1:] for row in cache.execute('SELECT path, sha, error FROM syntax')}
+        
+        keys = {}
+        paths = []
+        for file_path in swift_files:
+            path = str(file_path)
+            if version is not None and path in self.file_shas:
+                rel_path = self.rel_paths[str(file_path)]
+                key = hashlib.sha256(self.file_shas[path] + version.encode()).digest()
+                entry = cached.get(rel_path)
+                if entry and entry[0] == key:
+                    if entry[1] is not None:
+                        self.swiftc_diagnostics[path] = entry[1]
+                    continue
+                keys[path] = (rel_path, key)
+            paths.append(path)
+        
+        batches = [paths[i:i + SWIFTC_BATCH] for i in range(0, len(paths), SWIFTC_BATCH)]
+        
+        # The work happens in the compiler processes, so threads are enough
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            futures = [executor.submit(swiftc_errors, batch) for batch in batches]
+        
+        updates = []
+        for batch, future in zip(batches, futures):
+            try:
+                errors = future.result()
+            except Exception:
+                self.unparsed_files.update(batch)
+                continue
             
-            for file in files:
-                if file.endswith('.swift'):
-                    swift_files.append(Path(root) / file)
-                    
-        return sorted(swift_files)
+            self.swiftc_diagnostics.update(errors)
+            updates.extend(keys[path] + (errors.get(path),) for path in batch if path in keys)
+        
+        # Store all new results in a single transaction
+        with cache:
+            cache.executemany('INSERT OR REPLACE INTO syntax VALUES (?, ?, ?)', updates)
+        cache.close()
     
     def check_syntax(self, file_path):
         """Check Swift syntax using swiftc"""
-        try:
-            # Use swiftc syntax checking
-            import subprocess
-            result = subprocess.run(
-                ['swiftc', '-parse', str(file_path)],
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode != 0:
-                self.results['syntax_errors'].append({
-                    'file': str(file_path.relative_to(self.project_root)),
-                    'error': result.stderr
-                })
-        except Exception as e:
+        if str(file_path) in self.unparsed_files:
             # If swiftc not available, do basic syntax checks
             self.basic_syntax_check(file_path)
+        elif str(file_path) in self.swiftc_diagnostics:
+            self.results['syntax_errors'].append({
+                'file': self.rel_paths[str(file_path)],
+                'error': self.swiftc_diagnostics[str(file_path)]
+            })
+    
+    def scan_files(self, swift_files):
+        """Scan all files up front, reusing cached scans of unchanged files"""
+        cache = open_cache(self.project_root / CACHE_FILE)
+        cached = {row[0]: row[1:] for row in cache.execute('SELECT path, size, mtime_ns, sha, data FROM scan')}
+        racy_after = time.time_ns() - RACY_MTIME_NS
+        pending = []
+        updates = []
+        
+        for file_path in swift_files:
+            try:
+                rel_path = self.rel_paths[str(file_path)]
+                stat = os.stat(file_path)
+                entry = cached.get(rel_path)
+                
+                # A file whose size and mtime are as last seen is not read at all
+                if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                    self.file_shas[str(file_path)] = entry[2]
+                    self.scans[str(file_path)] = json.loads(entry[3])
+                    continue
+                
+                with open(file_path, 'rb') as f:
+                    raw = f.read()
+                
+                mtime_ns = stat.st_mtime_ns if stat.st_mtime_ns < racy_after else None
+                sha = hashlib.sha256(raw).digest()
+                self.file_shas[str(file_path)] = sha
+                if entry and entry[2] == sha:
+                    # Touched but unchanged; only its stat needs updating
+                    self.scans[str(file_path)] = json.loads(entry[3])
+                    updates.append((rel_path, stat.st_size, mtime_ns, sha, entry[3]))
+                    continue
+                
+                # Same newline handling as reading in text mode
+                content = raw.decode('utf-8')
+                if '\r' in content:
+                    content = content.replace('\r\n', '\n').replace('\r', '\n')
+                pending.append((str(file_path), (rel_path, stat.st_size, mtime_ns, sha), content))
+            except Exception as e:
+                # Reported by each check that needs the file
+                self.scan_errors[str(file_path)] = e
+        
+        # Files are independent, so scan new and changed ones across worker processes
+        contents = [content for _, _, content in pending]
+        if len(contents) < MIN_PARALLEL_FILES:
+            scans = map(scan_source, contents)
+        else:
+            chunksize = min(64, max(1, len(contents) // (4 * (os.cpu_count() or 1))))
+            with ProcessPoolExecutor() as executor:
+                scans = list(executor.map(scan_source, contents, chunksize=chunksize))
+        
+        for (key, row, _), scan in zip(pending, scans):
+            self.scans[key] = scan
+            updates.append(row + (json.dumps(scan),))
+        
+        # Store all new scans in a single transaction
+        with cache:
+            cache.executemany('INSERT OR REPLACE INTO scan VALUES (?, ?, ?, ?, ?)', updates)
+        cache.close()
+    
+    def scan_file(self, file_path):
+        """Return a file's scan, raising the error met reading it if there was one"""
+        key = str(file_path)
+        if key in self.scan_errors:
+            raise self.scan_errors[key]
+        return self.scans[key]
     
     def basic_syntax_check(self, file_path):
         """Basic syntax validation without compiler"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            scan = self.scan_file(file_path)
             
             # Check for basic syntax issues
-            issues = []
-            
-            # Balanced braces
-            if content.count('{') != content.count('}'):
-                issues.append("Unbalanced braces")
-            
-            # Balanced parentheses
-            if content.count('(') != content.count(')'):
-                issues.append("Unbalanced parentheses")
-            
-            # Balanced brackets
-            if content.count('[') != content.count(']'):
-                issues.append("Unbalanced brackets")
+            issues = list(scan['balance_issues'])
             
             # Check for @MainActor on ViewModels
-            if 'ViewModel' in file_path.name and '@MainActor' not in content:
+            if 'ViewModel' in file_path.name and not scan['main_actor']:
                 issues.append("ViewModel missing @MainActor annotation")
             
             if issues:
                 self.results['syntax_errors'].append({
-                    'file': str(file_path.relative_to(self.project_root)),
+                    'file': self.rel_paths[str(file_path)],
                     'issues': issues
                 })
                 
@@ -146,22 +545,20 @@ class FunctionalityChecker:
     def analyze_imports(self, file_path):
         """Extract and analyze import statements"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            scan = self.scan_file(file_path)
             
-            imports = re.findall(r'^import\s+(\S+)', content, re.MULTILINE)
-            self.file_imports[str(file_path)] = imports
+            self.file_imports[str(file_path)] = scan['imports']
             
             # Check for required imports
-            if 'View {' in content and 'import SwiftUI' not in content:
+            if scan['needs_swiftui']:
                 self.results['import_errors'].append({
-                    'file': str(file_path.relative_to(self.project_root)),
+                    'file': self.rel_paths[str(file_path)],
                     'missing': 'SwiftUI'
                 })
             
-            if 'Observable' in content and 'import Observation' not in content and '@Observable' in content:
+            if scan['needs_observation']:
                 self.results['import_errors'].append({
-                    'file': str(file_path.relative_to(self.project_root)),
+                    'file': self.rel_paths[str(file_path)],
                     'missing': 'Observation'
                 })
                 
@@ -171,27 +568,22 @@ class FunctionalityChecker:
     def extract_definitions(self, file_path):
         """Extract class, struct, enum, protocol definitions"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            scan = self.scan_file(file_path)
             
             # Extract protocols
-            protocols = re.findall(r'protocol\s+(\w+)', content)
-            for protocol in protocols:
+            for protocol in scan['protocols']:
                 self.protocols[protocol] = str(file_path)
             
             # Extract classes
-            classes = re.findall(r'class\s+(\w+)', content)
-            for cls in classes:
+            for cls in scan['classes']:
                 self.classes[cls] = str(file_path)
             
             # Extract structs
-            structs = re.findall(r'struct\s+(\w+)', content)
-            for struct in structs:
+            for struct in scan['structs']:
                 self.structs[struct] = str(file_path)
             
             # Extract enums
-            enums = re.findall(r'enum\s+(\w+)', content)
-            for enum in enums:
+            for enum in scan['enums']:
                 self.enums[enum] = str(file_path)
                 
         except Exception as e:
@@ -213,7 +605,7 @@ class FunctionalityChecker:
                     # Check if it's a local module
                     if not self.is_local_module(imp):
                         self.results['undefined_references'].append({
-                            'file': str(Path(file_path).relative_to(self.project_root)),
+                            'file': self.rel_paths[file_path],
                             'import': imp
                         })
     
@@ -233,100 +625,48 @@ class FunctionalityChecker:
                 if self.is_local_module(imp):
                     dependencies[file_name].add(imp)
         
-        # Check for cycles using DFS
-        def has_cycle(node, visited, rec_stack, graph):
-            visited.add(node)
-            rec_stack.add(node)
-            
-            for neighbor in graph.get(node, []):
-                if neighbor not in visited:
-                    if has_cycle(neighbor, visited, rec_stack, graph):
-                        return True
-                elif neighbor in rec_stack:
-                    return True
-            
-            rec_stack.remove(node)
-            return False
-        
-        visited = set()
-        for node in dependencies:
-            if node not in visited:
-                if has_cycle(node, visited, set(), dependencies):
-                    self.results['circular_dependencies'].append(node)
+        # Report each group of files and modules that depend on each other
+        for members in find_cycles(dependencies):
+            self.results['circular_dependencies'].append({'members': members})
     
     def check_unused_imports(self):
         """Find potentially unused imports"""
-        for file_path, imports in self.file_imports.items():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Remove import statements from content
-                content_without_imports = re.sub(r'^import.*$', '', content, flags=re.MULTILINE)
-                
-                for imp in imports:
-                    # Check if import is used (basic heuristic)
-                    if imp not in ['Foundation', 'SwiftUI', 'Combine']:  # Always needed
-                        if imp not in content_without_imports:
-                            self.results['unused_imports'].append({
-                                'file': str(Path(file_path).relative_to(self.project_root)),
-                                'import': imp
-                            })
-            except:
-                pass
+        for file_path in self.file_imports.keys():
+            for imp in self.scans[file_path]['unused_imports']:
+                self.results['unused_imports'].append({
+                    'file': self.rel_paths[file_path],
+                    'import': imp
+                })
     
     def check_protocol_conformance(self):
         """Check protocol conformance declarations"""
         for file_path in self.file_imports.keys():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Find protocol conformances
-                conformances = re.findall(r':\s*([^{]+)\s*{', content)
-                
-                for conformance in conformances:
-                    protocols = [p.strip() for p in conformance.split(',')]
-                    for protocol in protocols:
-                        if 'View' in protocol and 'body' not in content:
-                            self.results['protocol_conformance'].append({
-                                'file': str(Path(file_path).relative_to(self.project_root)),
-                                'issue': 'View protocol requires body property'
-                            })
-                        
-                        if 'ObservableObject' in protocol and '@Published' not in content:
-                            self.results['protocol_conformance'].append({
-                                'file': str(Path(file_path).relative_to(self.project_root)),
-                                'issue': 'ObservableObject typically needs @Published properties'
-                            })
-            except:
-                pass
+            for issue in self.scans[file_path]['conformance_issues']:
+                self.results['protocol_conformance'].append({
+                    'file': self.rel_paths[file_path],
+                    'issue': issue
+                })
     
     def check_type_consistency(self):
         """Check for type consistency issues"""
         for file_path in self.file_imports.keys():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Check for force unwrapping
-                force_unwraps = len(re.findall(r'!\s*[^=]', content))
-                if force_unwraps > 0:
-                    self.results['optional_handling'].append({
-                        'file': str(Path(file_path).relative_to(self.project_root)),
-                        'count': force_unwraps,
-                        'issue': 'Force unwrapping detected'
-                    })
-                
-                # Check for proper async/await usage
-                if 'async' in content:
-                    if 'Task {' not in content and 'await' not in content:
-                        self.results['async_issues'].append({
-                            'file': str(Path(file_path).relative_to(self.project_root)),
-                            'issue': 'Async function without proper await usage'
-                        })
-            except:
-                pass
+            scan = self.scans[file_path]
+            
+            # Check for force unwrapping
+            force_unwraps = scan['force_unwraps']
+            if force_unwraps > 0:
+                self.results['optional_handling'].append({
+                    'file': self.rel_paths[file_path],
+                    'count': force_unwraps,
+                    'issue': 'Force unwrapping detected'
+                })
+            
+            # Check for proper async/await usage
+            if scan['unawaited_async']:
+                self.results['async_issues'].append({
+                    'file': self.rel_paths[file_path],
+                    'issue': 'Async function without proper await usage'
+                })
     
     def check_mvvm_compliance(self):
         """Check MVVM architecture compliance"""
@@ -341,88 +681,68 @@ class FunctionalityChecker:
         
         # Check ViewModels have @MainActor
         for vm_file in viewmodel_files:
-            try:
-                with open(vm_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                if '@MainActor' not in content:
-                    self.results['architecture_violations'].append({
-                        'file': str(Path(vm_file).relative_to(self.project_root)),
-                        'issue': 'ViewModel should have @MainActor annotation'
-                    })
-                
-                # Check for business logic in ViewModel
-                if 'NavigationLink' in content or 'Button {' in content:
-                    self.results['architecture_violations'].append({
-                        'file': str(Path(vm_file).relative_to(self.project_root)),
-                        'issue': 'ViewModel contains UI code'
-                    })
-            except:
-                pass
+            scan = self.scans[vm_file]
+            
+            if not scan['main_actor']:
+                self.results['architecture_violations'].append({
+                    'file': self.rel_paths[vm_file],
+                    'issue': 'ViewModel should have @MainActor annotation'
+                })
+            
+            # Check for business logic in ViewModel
+            if scan['ui_code']:
+                self.results['architecture_violations'].append({
+                    'file': self.rel_paths[vm_file],
+                    'issue': 'ViewModel contains UI code'
+                })
         
         # Check Views don't have business logic
         for view_file in view_files:
-            try:
-                with open(view_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                if 'URLSession' in content or 'CoreDataManager' in content:
-                    self.results['architecture_violations'].append({
-                        'file': str(Path(view_file).relative_to(self.project_root)),
-                        'issue': 'View contains direct data access'
-                    })
-            except:
-                pass
+            if self.scans[view_file]['data_access']:
+                self.results['architecture_violations'].append({
+                    'file': self.rel_paths[view_file],
+                    'issue': 'View contains direct data access'
+                })
     
     def check_naming_conventions(self):
         """Check Swift naming conventions"""
         for file_path in self.file_imports.keys():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Check class/struct names (PascalCase)
-                type_names = re.findall(r'(?:class|struct|enum|protocol)\s+(\w+)', content)
-                for name in type_names:
-                    if not name[0].isupper():
-                        self.results['naming_violations'].append({
-                            'file': str(Path(file_path).relative_to(self.project_root)),
-                            'issue': f'Type {name} should be PascalCase'
-                        })
-                
-                # Check function names (camelCase)
-                func_names = re.findall(r'func\s+(\w+)', content)
-                for name in func_names:
-                    if name[0].isupper():
-                        self.results['naming_violations'].append({
-                            'file': str(Path(file_path).relative_to(self.project_root)),
-                            'issue': f'Function {name} should be camelCase'
-                        })
-            except:
-                pass
+            scan = self.scans[file_path]
+            
+            # Check class/struct names (PascalCase)
+            for name in scan['type_names']:
+                if not name[0].isupper():
+                    self.results['naming_violations'].append({
+                        'file': self.rel_paths[file_path],
+                        'issue': f'Type {name} should be PascalCase'
+                    })
+            
+            # Check function names (camelCase)
+            for name in scan['func_names']:
+                if name[0].isupper():
+                    self.results['naming_violations'].append({
+                        'file': self.rel_paths[file_path],
+                        'issue': f'Function {name} should be camelCase'
+                    })
     
     def check_async_patterns(self):
         """Check for proper async/await patterns"""
         for file_path in self.file_imports.keys():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Check for completion handlers that should be async
-                if 'completion:' in content and 'async' not in content:
-                    self.results['async_issues'].append({
-                        'file': str(Path(file_path).relative_to(self.project_root)),
-                        'issue': 'Consider converting completion handlers to async/await'
-                    })
-                
-                # Check for proper MainActor usage
-                if '@Published' in content and '@MainActor' not in content:
-                    self.results['async_issues'].append({
-                        'file': str(Path(file_path).relative_to(self.project_root)),
-                        'issue': '@Published properties should be on @MainActor'
-                    })
-            except:
-                pass
+            scan = self.scans[file_path]
+            
+            # Check for completion handlers that should be async
+            if scan['completion_handlers']:
+                self.results['async_issues'].append({
+                    'file': self.rel_paths[file_path],
+                    'issue': 'Consider converting completion handlers to async/await'
+                })
+            
+            # Check for proper MainActor usage
+            if scan['published_off_main_actor']:
+                self.results['async_issues'].append({
+                    'file': self.rel_paths[file_path],
+                    'issue': '@Published properties should be on @MainActor'
+                })
     
     def generate_report(self):
         """Generate comprehensive report"""
@@ -3,42 +3,104 @@
 
 import os
 import re
+import json
+import mmap
+import hashlib
+import sqlite3
+import time
 from pathlib import Path
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+
+# Per-file results are cached across runs, keyed by file content
+CACHE_FILE = '.onchange_usage_cache.db'
+
+# A file modified this recently (in ns) may change again without its size or
+# mtime moving, so its stat is not trusted to stand for its content
+RACY_MTIME_NS = 2_000_000_000
+
+# Below this many files to classify, starting worker processes costs more than it saves
+MIN_PARALLEL_FILES = 64
+
+# onChange closures taking one value (deprecated) or old and new values, compiled once
+DEPRECATED_RE = re.compile(r'\.onChange\s*\(\s*of:\s*[^)]+\)\s*\{\s*(?:newValue|value|_)\s*in')
+MODERN_RE = re.compile(r'\.onChange\s*\(\s*of:\s*[^)]+\)\s*\{\s*(?:oldValue|_)\s*,\s*(?:newValue|_)\s*in')
+
+def script_digest():
+    """Hash this script so cached results are dropped when it changes."""
+    with open(os.path.abspath(__file__), 'rb') as f:
+        return hashlib.sha256(f.read()).digest()
+
+def open_cache(path):
+    """Open the per-file results cache, emptying it if this script changed since it was written."""
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE IF NOT EXISTS script(digest BLOB)')
+    digest = script_digest()
+    if conn.execute('SELECT digest FROM script').fetchone() != (digest,):
+        with conn:
+            conn.execute('DROP TABLE IF EXISTS c')
+            conn.execute('DELETE FROM script')
+            conn.execute('INSERT INTO script VALUES (?)', (digest,))
+    conn.execute('CREATE TABLE IF NOT EXISTS c(path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha BLOB, results TEXT)')
+    return conn
+
+def map_file(f):
+    """Memory-map an open file for reading; an empty file, which cannot be mapped, reads as b''."""
+    if os.fstat(f.fileno()).st_size == 0:
+        return nullcontext(b'')
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
 def check_onchange_usage(file_path):
     """Check if a file uses deprecated onChange pattern."""
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
-        lines = content.split('\n')
-    
-    deprecated_pattern = re.compile(r'\.onChange\s*\(\s*of:\s*[^)]+\)\s*\{\s*(?:newValue|value|_)\s*in')
-    modern_pattern = re.compile(r'\.onChange\s*\(\s*of:\s*[^)]+\)\s*\{\s*(?:oldValue|_)\s*,\s*(?:newValue|_)\s*in')
     
+    return find_onchange_usage(content)
+
+def find_onchange_usage(content):
+    """Classify the .onChange calls in a Swift source."""
     results = []
     
-    for i, line in enumerate(lines, 1):
-        if '.onChange' in line:
-            # Check if it's the modern pattern (with two parameters)
-            if modern_pattern.search(line):
-                results.append((i, line.strip(), 'modern'))
-            # Check if it's the deprecated pattern (single parameter)
-            elif deprecated_pattern.search(line):
-                results.append((i, line.strip(), 'deprecated'))
-            # If it contains onChange but doesn't match either pattern, flag for manual review
-            elif '.onChange' in line:
-                # Look ahead to see the closure pattern
-                closure_start = i
-                closure_content = []
-                for j in range(i, min(i+5, len(lines))):
-                    closure_content.append(lines[j-1])
-                
-                full_text = '\n'.join(closure_content)
-                if modern_pattern.search(full_text):
-                    results.append((i, line.strip(), 'modern'))
-                elif deprecated_pattern.search(full_text):
-                    results.append((i, line.strip(), 'deprecated'))
-                else:
-                    results.append((i, line.strip(), 'unknown'))
+    # Jump from one line with .onChange to the next instead of splitting the
+    # file into lines; line numbers are kept by counting the newlines skipped
+    line_num = 1
+    pos = 0
+    start = content.find('.onChange')
+    while start != -1:
+        line_start = content.rfind('\n', 0, start) + 1
+        line_end = content.find('\n', start)
+        if line_end == -1:
+            line_end = len(content)
+        line_num += content.count('\n', pos, line_start)
+        pos = line_start
+        line = content[line_start:line_end]
+        
+        # Check if it's the modern pattern (with two parameters)
+        if MODERN_RE.search(line):
+            results.append((line_num, line.strip(), 'modern'))
+        # Check if it's the deprecated pattern (single parameter)
+        elif DEPRECATED_RE.search(line):
+            results.append((line_num, line.strip(), 'deprecated'))
+        # If it contains onChange but doesn't match either pattern, flag for manual review
+        else:
+            # Look ahead to see the closure pattern: this line and up to four
+            # more, never including the text after the file's last newline
+            window_end = line_start - 1
+            for _ in range(5):
+                next_end = content.find('\n', window_end + 1)
+                if next_end == -1:
+                    break
+                window_end = next_end
+            
+            full_text = content[line_start:max(window_end, line_start)]
+            if MODERN_RE.search(full_text):
+                results.append((line_num, line.strip(), 'modern'))
+            elif DEPRECATED_RE.search(full_text):
+                results.append((line_num, line.strip(), 'deprecated'))
+            else:
+                results.append((line_num, line.strip(), 'unknown'))
+        
+        start = content.find('.onChange', line_end)
     
     return results
 
@@ -50,11 +112,58 @@ def main():
     modern_files = []
     unknown_files = []
     
+    cache = open_cache(project_root / CACHE_FILE)
+    cached = {row[0]: row[1:] for row in cache.execute('SELECT path, size, mtime_ns, sha, results FROM c')}
+    updates = []
+    racy_after = time.time_ns() - RACY_MTIME_NS
+    
+    results_of = {}
+    pending = []
+    
     for swift_file in swift_files:
         if '.build' in str(swift_file) or 'DerivedData' in str(swift_file):
             continue
-            
-        results = check_onchange_usage(swift_file)
+        
+        # Reuse the results from the last run if the file is unchanged. A file
+        # whose size and mtime are as last seen is not read at all; otherwise
+        # it is hashed (and decoded if needed) straight from its mapping
+        rel_path = str(swift_file.relative_to(project_root))
+        stat = swift_file.stat()
+        entry = cached.get(rel_path)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            results_of[swift_file] = [tuple(result) for result in json.loads(entry[3])]
+            continue
+        
+        mtime_ns = stat.st_mtime_ns if stat.st_mtime_ns < racy_after else None
+        with open(swift_file, 'rb') as f, map_file(f) as data:
+            sha = hashlib.sha256(data).digest()
+            if entry and entry[2] == sha:
+                # Touched but unchanged; only its stat needs updating
+                results_of[swift_file] = [tuple(result) for result in json.loads(entry[3])]
+                updates.append((rel_path, stat.st_size, mtime_ns, sha, entry[3]))
+                continue
+            content = str(data, 'utf-8')
+        
+        # Same newline handling as reading in text mode
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        pending.append((swift_file, (rel_path, stat.st_size, mtime_ns, sha), content))
+    
+    # Files are independent, so classify new and changed ones across worker processes
+    contents = [content for _, _, content in pending]
+    if len(contents) < MIN_PARALLEL_FILES:
+        found = map(find_onchange_usage, contents)
+    else:
+        chunksize = min(64, max(1, len(contents) // (4 * (os.cpu_count() or 1))))
+        with ProcessPoolExecutor() as executor:
+            found = list(executor.map(find_onchange_usage, contents, chunksize=chunksize))
+    
+    for (swift_file, row, _), results in zip(pending, found):
+        results_of[swift_file] = results
+        updates.append(row + (json.dumps(results),))
+    
+    for swift_file in swift_files:
+        results = results_of.get(swift_file)
         if results:
             has_deprecated = any(r[2] == 'deprecated' for r in results)
             has_unknown = any(r[2] == 'unknown' for r in results)
@@ -66,6 +175,11 @@ def main():
             else:
                 modern_files.append((swift_file, results))
     
+    # Store all new results in a single transaction
+    with cache:
+        cache.executemany('INSERT OR REPLACE INTO c VALUES (?, ?, ?, ?, ?)', updates)
+    cache.close()
+    
     # Print results
     print(f"Total Swift files scanned: {len(swift_files)}")
     print(f"Files with .onChange: {len(deprecated_files) + len(modern_files) + len(unknown_files)}")
@@ -8,8 +8,382 @@ Simulates runtime scenarios to detect potential issues
 import os
 import re
 import json
+import time
+import hashlib
+import sqlite3
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+# Per-file issues are cached across runs, keyed by file content
+CACHE_FILE = '.runtime_simulation_cache.db'
+
+# A file modified this recently (in ns) may change again without its size or
+# mtime moving, so its stat is not trusted to stand for its content
+RACY_MTIME_NS = 2_000_000_000
+
+# Below this many files to check, starting worker processes costs more than it saves
+MIN_PARALLEL_FILES = 64
+
+# Patterns, compiled once. Each one is only run on text containing a literal
+# that all of its matches contain, so most files and lines are settled by a
+# substring test
+COLLECTION_UNWRAP_RE = re.compile(r'\[.+\]!')
+# A hard-coded index; the variable indexed is the word right before it
+INDEX_RE = re.compile(r'\[(\d+)\]')
+# The rest of an optional chain after its first word: '?.' and two or more 'word?.'
+CHAIN_TAIL_RE = re.compile(r'\?\.(?:\w+\?\.){2,}')
+ASYNC_FUNC_RE = re.compile(r'func\s+(\w+).*async\s*(?:throws\s*)?->')
+
+# Closures capturing self strongly, by the pattern reported for them
+CLOSURE_PATTERNS = [
+    (pattern, re.compile(pattern))
+    for pattern in (
+        r'{\s*\n\s*self\.',
+        r'{\s*self\.',
+        r'Timer\.scheduledTimer.*{\s*self',
+        r'DispatchQueue.*{\s*self'
+    )
+]
+
+def script_digest():
+    """Hash this script so cached issues are dropped when it changes"""
+    with open(os.path.abspath(__file__), 'rb') as f:
+        return hashlib.sha256(f.read()).digest()
+
+def open_cache(path):
+    """Open the per-file issue cache, emptying it if this script changed since it was written"""
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE IF NOT EXISTS script(digest BLOB)')
+    digest = script_digest()
+    if conn.execute('SELECT digest FROM script').fetchone() != (digest,):
+        with conn:
+            conn.execute('DROP TABLE IF EXISTS issues')
+            conn.execute('DELETE FROM script')
+            conn.execute('INSERT INTO script VALUES (?)', (digest,))
+    conn.execute('CREATE TABLE IF NOT EXISTS issues(path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha BLOB, found TEXT)')
+    return conn
+
+def word_start(content, end):
+    """Start of the run of regex word characters ending at end"""
+    start = end
+    while start and (content[start - 1].isalnum() or content[start - 1] == '_'):
+        start -= 1
+    return start
+
+# A pattern starting with \w+ is tried at every character of every word. The
+# scans below find the rare text after the word first and walk back over the
+# word; a match of the pattern always starts where that word does, so they
+# find the same matches
+
+def index_accesses(content):
+    """(variable, index) pairs of the hard-coded index accesses, like items[2]"""
+    # Same pairs as findall(r'(\w+)\[(\d+)\]')
+    accesses = []
+    for match in INDEX_RE.finditer(content):
+        start = word_start(content, match.start())
+        if start < match.start():
+            accesses.append((content[start:match.start()], match.group(1)))
+    return accesses
+
+def long_optional_chains(content):
+    """Optional chains of three or more links, like a?.b?.c?."""
+    # Same chains as findall(r'(\w+\?\.(?:\w+\?\.){2,})'). A tail with no word
+    # before it is no chain, but a chain may start inside it
+    chains = []
+    pos = 0
+    while True:
+        match = CHAIN_TAIL_RE.search(content, pos)
+        if match is None:
+            return chains
+        start = word_start(content, match.start())
+        if start < match.start():
+            chains.append(content[start:match.end()])
+            pos = match.end()
+        else:
+            pos = match.start() + 1
+
+def has_nested_loop(content):
+    """Whether a 'for' and a '{' are followed by another 'for' and '{' (as r'for.*{.*for.*{' would find)"""
+    # Taking the earliest occurrence of each in turn finds a match if there is one
+    pos = 0
+    for literal, length in (('for', 3), ('{', 1), ('for', 3), ('{', 1)):
+        pos = content.find(literal, pos)
+        if pos == -1:
+            return False
+        pos += length
+    return True
+
+def check_force_unwrap_scenarios(file_path, rel_path, content):
+    """Simulate force unwrap crash scenarios"""
+    issues = []
+    
+    # Every issue needs a '!', so only the lines containing one are looked
+    # at; they are found by jumping from one '!' to the next, counting the
+    # newlines passed on the way
+    line_num = 1
+    line_start = 0
+    pos = content.find('!')
+    while pos != -1:
+        start = content.rfind('\n', 0, pos) + 1
+        line_num += content.count('\n', line_start, start)
+        line_start = start
+        end = content.find('\n', pos)
+        if end == -1:
+            end = len(content)
+        line = content[start:end]
+        pos = content.find('!', end)
+        
+        # Force unwrap after optional chain
+        if '?.' in line:
+            issues.append({
+                'file': rel_path,
+                'line': line_num,
+                'code': line.strip(),
+                'issue': 'Force unwrap after optional chain',
+                'severity': 'high'
+            })
+        
+        # Force unwrap dictionary/array access
+        if ']!' in line and COLLECTION_UNWRAP_RE.search(line):
+            issues.append({
+                'file': rel_path,
+                'line': line_num,
+                'code': line.strip(),
+                'issue': 'Force unwrap collection access',
+                'severity': 'critical'
+            })
+        
+        # as! force cast
+        if ' as! ' in line:
+            issues.append({
+                'file': rel_path,
+                'line': line_num,
+                'code': line.strip(),
+                'issue': 'Force cast',
+                'severity': 'high'
+            })
+    
+    return issues
+
+def check_array_bounds(file_path, rel_path, content):
+    """Check for potential array index out of bounds"""
+    issues = []
+    
+    # Direct index access without bounds check
+    for var_name, index in index_accesses(content):
+        if int(index) > 0:  # Non-zero index
+            issues.append({
+                'file': rel_path,
+                'issue': f'Hard-coded array index [{index}] without bounds check',
+                'variable': var_name,
+                'severity': 'medium'
+            })
+    
+    # .first! or .last! usage
+    if '.first!' in content or '.last!' in content:
+        issues.append({
+            'file': rel_path,
+            'issue': 'Force unwrapping first/last on collection',
+            'severity': 'high'
+        })
+    
+    return issues
+
+def check_optional_chaining(file_path, rel_path, content):
+    """Check optional handling patterns"""
+    issues = []
+    
+    # Multiple optional chains
+    for chain in long_optional_chains(content):
+        issues.append({
+            'file': rel_path,
+            'issue': 'Long optional chain',
+            'chain': chain,
+            'severity': 'low'
+        })
+    
+    return issues
+
+def check_async_await_issues(file_path, rel_path, content):
+    """Check async/await usage patterns"""
+    issues = []
+    
+    # Async function without error handling
+    async_funcs = ASYNC_FUNC_RE.findall(content) if 'async' in content else []
+    for func in async_funcs:
+        if f'try await {func}' not in content and f'await {func}' in content:
+            issues.append({
+                'file': rel_path,
+                'function': func,
+                'issue': 'Async function called without try',
+                'severity': 'medium'
+            })
+    
+    # Task without error handling
+    if 'Task {' in content and 'try' not in content:
+        lines = content.split('\n')
+        for i, line in enumerate(lines):
+            if 'Task {' in line:
+                # Check next 10 lines for try
+                task_block = '\n'.join(lines[i:i+10])
+                if 'try' not in task_block:
+                    issues.append({
+                        'file': rel_path,
+                        'line': i + 1,
+                        'issue': 'Task without error handling',
+                        'severity': 'medium'
+                    })
+    
+    return issues
+
+def check_memory_retain_cycles(file_path, rel_path, content):
+    """Check for potential retain cycles"""
+    issues = []
+    
+    # Closure without weak self
+    if '[weak self]' not in content:
+        for pattern, closure_re in CLOSURE_PATTERNS:
+            if closure_re.search(content):
+                issues.append({
+                    'file': rel_path,
+                    'issue': 'Potential retain cycle in closure',
+                    'pattern': pattern,
+                    'severity': 'high'
+                })
+    
+    # Delegate not weak
+    if 'delegate:' in content and 'weak var delegate' not in content:
+        issues.append({
+            'file': rel_path,
+            'issue': 'Delegate should be weak',
+            'severity': 'high'
+        })
+    
+    return issues
+
+def check_api_error_handling(file_path, rel_path, content):
+    """Check API error handling"""
+    issues = []
+    
+    api_patterns = [
+        'URLSession.shared',
+        'Firebase',
+        'ClaudeAIClient',
+        'CoreDataManager'
+    ]
+    
+    apis = [api for api in api_patterns if api in content]
+    if not apis:
+        return issues
+    
+    # The same for every API used, so each is looked for once. Lowercasing
+    # keeps 'logger', so the lowercased copy is only made when it is absent
+    has_catch = 'catch' in content
+    unhandled = not has_catch and 'Result<' not in content
+    unlogged = has_catch and 'logger' not in content and 'logger' not in content.lower()
+    
+    for api in apis:
+        # Check for proper error handling
+        if unhandled:
+            issues.append({
+                'file': rel_path,
+                'api': api,
+                'issue': 'API usage without error handling',
+                'severity': 'high'
+            })
+        
+        # Check for error logging
+        if unlogged:
+            issues.append({
+                'file': rel_path,
+                'api': api,
+                'issue': 'Error caught but not logged',
+                'severity': 'medium'
+            })
+    
+    return issues
+
+def check_concurrency_safety(file_path, rel_path, content):
+    """Check concurrency safety issues"""
+    issues = []
+    
+    # @Published without @MainActor
+    if '@Published' in content and 'ViewModel' in file_path:
+        if '@MainActor' not in content:
+            issues.append({
+                'file': rel_path,
+                'issue': '@Published properties need @MainActor',
+                'severity': 'high'
+            })
+    
+    # UI updates not on main thread
+    ui_updates = ['self.', '.text =', '.isHidden =', '.alpha =']
+    # Check if it's in an async context
+    if 'Task { @MainActor' not in content and 'async' in content:
+        for update in ui_updates:
+            if update in content:
+                issues.append({
+                    'file': rel_path,
+                    'issue': 'Potential UI update off main thread',
+                    'pattern': update,
+                    'severity': 'critical'
+                })
+    
+    return issues
+
+def check_performance_bottlenecks(file_path, rel_path, content):
+    """Check for performance issues"""
+    issues = []
+    
+    # Nested loops
+    if has_nested_loop(content):
+        issues.append({
+            'file': rel_path,
+            'issue': 'Nested loops detected',
+            'severity': 'medium'
+        })
+    
+    # Multiple filter/map chains
+    if content.count('.filter') + content.count('.map') > 3:
+        issues.append({
+            'file': rel_path,
+            'issue': 'Multiple filter/map operations',
+            'severity': 'low'
+        })
+    
+    # Large data in memory
+    if 'Data(' in content and '.count > 1000000' in content:
+        issues.append({
+            'file': rel_path,
+            'issue': 'Large data operation',
+            'severity': 'high'
+        })
+    
+    return issues
+
+# The per-file checks in report order: the progress line printed for each,
+# the checker list its issues go to, and the check itself
+FILE_CHECKS = (
+    ("\n💥 Checking Force Unwrap Scenarios...", 'potential_crashes', check_force_unwrap_scenarios),
+    ("\n📊 Checking Array Bounds...", 'potential_crashes', check_array_bounds),
+    ("\n❓ Checking Optional Handling...", 'potential_crashes', check_optional_chaining),
+    ("\n⏳ Checking Async/Await Patterns...", 'concurrency_issues', check_async_await_issues),
+    ("\n💾 Checking Memory Retain Cycles...", 'memory_issues', check_memory_retain_cycles),
+    ("\n🌐 Checking API Error Handling...", 'api_issues', check_api_error_handling),
+    ("\n🔒 Checking Concurrency Safety...", 'concurrency_issues', check_concurrency_safety),
+    ("\n⚡ Checking Performance Bottlenecks...", 'performance_issues', check_performance_bottlenecks),
+)
+
+def analyze_source(file_path, rel_path, content):
+    """Run every per-file check on one Swift source, returning each check's issues in FILE_CHECKS order"""
+    found = []
+    for _, _, check in FILE_CHECKS:
+        try:
+            found.append(check(file_path, rel_path, content))
+        except Exception:
+            found.append([])
+    return found
 
 class RuntimeSimulationChecker:
     def __init__(self, project_root):
@@ -25,302 +399,105 @@ class RuntimeSimulationChecker:
         print("🔮 Runtime Simulation Analysis")
         print("=" * 60)
         
-        self.check_force_unwrap_scenarios()
-        self.check_array_bounds()
-        self.check_optional_chaining()
-        self.check_async_await_issues()
-        self.check_memory_retain_cycles()
-        self.check_api_error_handling()
-        self.check_concurrency_safety()
-        self.check_performance_bottlenecks()
+        # Each file is read once and given to every check; a file that
+        # cannot be read is skipped by all of them. Unchanged files reuse the
+        # issues found last run
+        cache = open_cache(self.project_root / CACHE_FILE)
+        cached = {row[0]: row[1:] for row in cache.execute('SELECT path, size, mtime_ns, sha, found FROM issues')}
+        racy_after = time.time_ns() - RACY_MTIME_NS
+        swift_files = self.collect_swift_files()
+        found_in = {}
+        pending = []
+        updates = []
         
-        self.generate_simulation_report()
-    
-    def check_force_unwrap_scenarios(self):
-        """Simulate force unwrap crash scenarios"""
-        print("\n💥 Checking Force Unwrap Scenarios...")
-        
-        for file_path in self.collect_swift_files():
+        for file_path in swift_files:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
+                rel_path = str(file_path.relative_to(self.project_root))
+                stat = os.stat(file_path)
+                entry = cached.get(rel_path)
                 
-                for i, line in enumerate(lines):
-                    # Force unwrap after optional chain
-                    if '?.' in line and '!' in line:
-                        self.potential_crashes.append({
-                            'file': str(file_path.relative_to(self.project_root)),
-                            'line': i + 1,
-                            'code': line.strip(),
-                            'issue': 'Force unwrap after optional chain',
-                            'severity': 'high'
-                        })
-                    
-                    # Force unwrap dictionary/array access
-                    if re.search(r'\[.+\]!', line):
-                        self.potential_crashes.append({
-                            'file': str(file_path.relative_to(self.project_root)),
-                            'line': i + 1,
-                            'code': line.strip(),
-                            'issue': 'Force unwrap collection access',
-                            'severity': 'critical'
-                        })
-                    
-                    # as! force cast
-                    if ' as! ' in line:
-                        self.potential_crashes.append({
-                            'file': str(file_path.relative_to(self.project_root)),
-                            'line': i + 1,
-                            'code': line.strip(),
-                            'issue': 'Force cast',
-                            'severity': 'high'
-                        })
-            except:
-                pass
-    
-    def check_array_bounds(self):
-        """Check for potential array index out of bounds"""
-        print("\n📊 Checking Array Bounds...")
-        
-        for file_path in self.collect_swift_files():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                # A file whose size and mtime are as last seen is not read at all
+                if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                    found_in[file_path] = json.loads(entry[3])
+                    continue
                 
-                # Direct index access without bounds check
-                index_accesses = re.findall(r'(\w+)\[(\d+)\]', content)
-                for var_name, index in index_accesses:
-                    if int(index) > 0:  # Non-zero index
-                        self.potential_crashes.append({
-                            'file': str(file_path.relative_to(self.project_root)),
-                            'issue': f'Hard-coded array index [{index}] without bounds check',
-                            'variable': var_name,
-                            'severity': 'medium'
-                        })
+                with open(file_path, 'rb') as f:
+                    raw = f.read()
                 
-                # .first! or .last! usage
-                if '.first!' in content or '.last!' in content:
-                    self.potential_crashes.append({
-                        'file': str(file_path.relative_to(self.project_root)),
-                        'issue': 'Force unwrapping first/last on collection',
-                        'severity': 'high'
-                    })
-            except:
-                pass
-    
-    def check_optional_chaining(self):
-        """Check optional handling patterns"""
-        print("\n❓ Checking Optional Handling...")
-        
-        for file_path in self.collect_swift_files():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                mtime_ns = stat.st_mtime_ns if stat.st_mtime_ns < racy_after else None
+                sha = hashlib.sha256(raw).digest()
+                if entry and entry[2] == sha:
+                    # Touched but unchanged; only its stat needs updating
+                    found_in[file_path] = json.loads(entry[3])
+                    updates.append((rel_path, stat.st_size, mtime_ns, sha, entry[3]))
+                    continue
                 
-                # Multiple optional chains
-                long_chains = re.findall(r'(\w+\?\.(?:\w+\?\.){2,})', content)
-                for chain in long_chains:
-                    self.potential_crashes.append({
-                        'file': str(file_path.relative_to(self.project_root)),
-                        'issue': 'Long optional chain',
-                        'chain': chain,
-                        'severity': 'low'
-                    })
-            except:
-                pass
-    
-    def check_async_await_issues(self):
-        """Check async/await usage patterns"""
-        print("\n⏳ Checking Async/Await Patterns...")
+                # Same newline handling as reading in text mode
+                content = raw.decode('utf-8')
+                if '\r' in content:
+                    content = content.replace('\r\n', '\n').replace('\r', '\n')
+                pending.append((file_path, (rel_path, stat.st_size, mtime_ns, sha), content))
+            except Exception:
+                continue
         
-        for file_path in self.collect_swift_files():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Async function without error handling
-                async_funcs = re.findall(r'func\s+(\w+).*async\s*(?:throws\s*)?->', content)
-                for func in async_funcs:
-                    if f'try await {func}' not in content and f'await {func}' in content:
-                        self.concurrency_issues.append({
-                            'file': str(file_path.relative_to(self.project_root)),
-                            'function': func,
-                            'issue': 'Async function called without try',
-                            'severity': 'medium'
-                        })
-                
-                # Task without error handling
-                if 'Task {' in content and 'try' not in content:
-                    lines = content.split('\n')
-                    for i, line in enumerate(lines):
-                        if 'Task {' in line:
-                            # Check next 10 lines for try
-                            task_block = '\n'.join(lines[i:i+10])
-                            if 'try' not in task_block:
-                                self.concurrency_issues.append({
-                                    'file': str(file_path.relative_to(self.project_root)),
-                                    'line': i + 1,
-                                    'issue': 'Task without error handling',
-                                    'severity': 'medium'
-                                })
-            except:
-                pass
-    
-    def check_memory_retain_cycles(self):
-        """Check for potential retain cycles"""
-        print("\n💾 Checking Memory Retain Cycles...")
+        # Files are independent, so check new and changed ones across worker processes
+        args = (
+            [str(file_path) for file_path, _, _ in pending],
+            [row[0] for _, row, _ in pending],
+            [content for _, _, content in pending],
+        )
+        if len(pending) < MIN_PARALLEL_FILES:
+            results = map(analyze_source, *args)
+        else:
+            chunksize = min(64, max(1, len(pending) // (4 * (os.cpu_count() or 1))))
+            with ProcessPoolExecutor() as executor:
+                results = list(executor.map(analyze_source, *args, chunksize=chunksize))
         
-        for file_path in self.collect_swift_files():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Closure without weak self
-                closure_patterns = [
-                    r'{\s*\n\s*self\.',
-                    r'{\s*self\.',
-                    r'Timer\.scheduledTimer.*{\s*self',
-                    r'DispatchQueue.*{\s*self'
-                ]
-                
-                for pattern in closure_patterns:
-                    if re.search(pattern, content) and '[weak self]' not in content:
-                        self.memory_issues.append({
-                            'file': str(file_path.relative_to(self.project_root)),
-                            'issue': 'Potential retain cycle in closure',
-                            'pattern': pattern,
-                            'severity': 'high'
-                        })
-                
-                # Delegate not weak
-                if 'delegate:' in content and 'weak var delegate' not in content:
-                    self.memory_issues.append({
-                        'file': str(file_path.relative_to(self.project_root)),
-                        'issue': 'Delegate should be weak',
-                        'severity': 'high'
-                    })
-            except:
-                pass
-    
-    def check_api_error_handling(self):
-        """Check API error handling"""
-        print("\n🌐 Checking API Error Handling...")
+        for (file_path, row, _), file_found in zip(pending, results):
+            found_in[file_path] = file_found
+            updates.append(row + (json.dumps(file_found),))
         
-        api_patterns = [
-            'URLSession.shared',
-            'Firebase',
-            'ClaudeAIClient',
-            'CoreDataManager'
-        ]
+        # Store all new results in a single transaction
+        with cache:
+            cache.executemany('INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?)', updates)
+        cache.close()
         
-        for file_path in self.collect_swift_files():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                for api in api_patterns:
-                    if api in content:
-                        # Check for proper error handling
-                        if 'catch' not in content and 'Result<' not in content:
-                            self.api_issues.append({
-                                'file': str(file_path.relative_to(self.project_root)),
-                                'api': api,
-                                'issue': 'API usage without error handling',
-                                'severity': 'high'
-                            })
-                        
-                        # Check for error logging
-                        if 'catch' in content and 'logger' not in content.lower():
-                            self.api_issues.append({
-                                'file': str(file_path.relative_to(self.project_root)),
-                                'api': api,
-                                'issue': 'Error caught but not logged',
-                                'severity': 'medium'
-                            })
-            except:
-                pass
-    
-    def check_concurrency_safety(self):
-        """Check concurrency safety issues"""
-        print("\n🔒 Checking Concurrency Safety...")
+        found = [[] for _ in FILE_CHECKS]
+        for file_path in swift_files:
+            for issues, file_issues in zip(found, found_in.get(file_path, ())):
+                issues.extend(file_issues)
         
-        for file_path in self.collect_swift_files():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # @Published without @MainActor
-                if '@Published' in content and 'ViewModel' in str(file_path):
-                    if '@MainActor' not in content:
-                        self.concurrency_issues.append({
-                            'file': str(file_path.relative_to(self.project_root)),
-                            'issue': '@Published properties need @MainActor',
-                            'severity': 'high'
-                        })
-                
-                # UI updates not on main thread
-                ui_updates = ['self.', '.text =', '.isHidden =', '.alpha =']
-                for update in ui_updates:
-                    if update in content and 'Task { @MainActor' not in content:
-                        # Check if it's in an async context
-                        if 'async' in content:
-                            self.concurrency_issues.append({
-                                'file': str(file_path.relative_to(self.project_root)),
-                                'issue': 'Potential UI update off main thread',
-                                'pattern': update,
-                                'severity': 'critical'
-                            })
-            except:
-                pass
-    
-    def check_performance_bottlenecks(self):
-        """Check for performance issues"""
-        print("\n⚡ Checking Performance Bottlenecks...")
+        # Issues are reported check by check, as if each check ran over all files in turn
+        for (progress, category, _), issues in zip(FILE_CHECKS, found):
+            print(progress)
+            getattr(self, category).extend(issues)
         
-        for file_path in self.collect_swift_files():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Nested loops
-                if re.search(r'for.*{.*for.*{', content, re.DOTALL):
-                    self.performance_issues.append({
-                        'file': str(file_path.relative_to(self.project_root)),
-                        'issue': 'Nested loops detected',
-                        'severity': 'medium'
-                    })
-                
-                # Multiple filter/map chains
-                if content.count('.filter') + content.count('.map') > 3:
-                    self.performance_issues.append({
-                        'file': str(file_path.relative_to(self.project_root)),
-                        'issue': 'Multiple filter/map operations',
-                        'severity': 'low'
-                    })
-                
-                # Large data in memory
-                if 'Data(' in content and '.count > 1000000' in content:
-                    self.performance_issues.append({
-                        'file': str(file_path.relative_to(self.project_root)),
-                        'issue': 'Large data operation',
-                        'severity': 'high'
-                    })
-            except:
-                pass
+        self.generate_simulation_report()
     
     def collect_swift_files(self):
         """Collect all Swift files"""
         swift_files = []
         exclude_dirs = {'DerivedData', '.build', 'Pods', '.git'}
         
-        for root, dirs, files in os.walk(self.project_root / 'MedicationManager'):
-            dirs[:] = [d for d in dirs if d not in exclude_dirs]
-            
-            for file in files:
-                if file.endswith('.swift'):
-                    swift_files.append(Path(root) / file)
-                    
-        return sorted(swift_files)
+        # scandir reports each entry's type without a stat per entry; paths stay
+        # strings until they are sorted
+        stack = [str(self.project_root / 'MedicationManager')]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            # Symlinked directories are not followed, as with os.walk
+                            if entry.name not in exclude_dirs and not entry.is_symlink():
+                                stack.append(entry.path)
+                        elif entry.name.endswith('.swift'):
+                            swift_files.append(entry.path)
+            except OSError:
+                continue
+        
+        # Sorted component-wise, the same order as sorting the Paths
+        return [Path(path) for path in sorted(swift_files, key=lambda path: path.split(os.sep))]
     
     def generate_simulation_report(self):
         """Generate simulation report"""